@@ -0,0 +1,59 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Hashable, Optional
+from fastapi import Request, Response
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+
+
+class ResponseCache:
+    """저장소 버전별로 직렬화된 JSON 응답을 보관하는 LRU 캐시
+
+    키에 저장소 버전을 넣기 때문에 점수가 추가되면 이전 항목은 다시 쓰이지 않고 밀려난다.
+    ETag 는 본문 해시라서 버전이 바뀌어도 내용이 같으면(예: 순위 밖 점수 추가) 304 로 답할 수 있다.
+    """
+
+    def __init__(self, max_entries: int = 256, max_age: int = 0):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._entries: 'OrderedDict[Hashable, CachedResponse]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: Hashable, body: bytes) -> CachedResponse:
+        entry = CachedResponse(body=body, etag='"%s"' % hashlib.sha1(body).hexdigest())
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def respond(self, request: Request, entry: CachedResponse) -> Response:
+        """ETag/Cache-Control 을 붙인 응답 - If-None-Match 가 맞으면 304"""
+        headers = {
+            'ETag': entry.etag,
+            'Cache-Control': f'public, max-age={self.max_age}' if self.max_age > 0 else 'no-cache',
+        }
+        if _etag_matches(request.headers.get('if-none-match'), entry.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type='application/json', headers=headers)
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    candidates = [tag.strip() for tag in header.split(',')]
+    return '*' in candidates or etag in candidates or f'W/{etag}' in candidates
@@ -0,0 +1,71 @@
+from array import array
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterable, Iterator, Optional
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+
+def timestamp_to_micros(timestamp: Optional[str]) -> int:
+    """ISO 문자열 시각 -> epoch 마이크로초 (로컬 시각 기준, GameScore 와 같은 규칙)"""
+    if timestamp is None:
+        dt = datetime.now()
+    else:
+        dt = datetime.fromisoformat(timestamp)
+        if dt.tzinfo is not None:
+            dt = dt.astimezone().replace(tzinfo=None)
+    return (dt - EPOCH) // MICROSECOND
+
+
+def micros_to_timestamp(micros: int) -> str:
+    """epoch 마이크로초 -> ``datetime.isoformat()`` 과 같은 문자열"""
+    return (EPOCH + timedelta(microseconds=micros)).isoformat()
+
+
+class ScoreColumns:
+    """점수를 열 단위로 보관 - 행마다 객체나 문자열을 만들지 않는다
+
+    - times, clicks: ``array('i')``
+    - timestamps: epoch 마이크로초 ``array('q')``
+
+    각 열은 array 대신 mmap 위의 memoryview 여도 된다 (BinaryScoreStore).
+    """
+
+    def __init__(self, times=None, clicks=None, timestamps=None):
+        self.times = times if times is not None else array('i')
+        self.clicks = clicks if clicks is not None else array('i')
+        self.timestamps = timestamps if timestamps is not None else array('q')
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> 'ScoreColumns':
+        columns = cls()
+        for record in records:
+            columns.append(record)
+        return columns
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def append(self, record: Dict[str, Any]) -> None:
+        self.times.append(record.get('time', 0))
+        self.clicks.append(record.get('clicks', 0))
+        self.timestamps.append(timestamp_to_micros(record.get('timestamp')))
+
+    def row(self, i: int) -> Dict[str, Any]:
+        return {
+            'time': self.times[i],
+            'clicks': self.clicks[i],
+            'timestamp': micros_to_timestamp(self.timestamps[i])
+        }
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self.row(i)
+
+    def slice(self, start: int = 0, stop: Optional[int] = None) -> 'ScoreColumns':
+        """array 면 복사본, memoryview 면 복사 없는 뷰"""
+        return ScoreColumns(
+            self.times[start:stop],
+            self.clicks[start:stop],
+            self.timestamps[start:stop],
+        )
@@ -0,0 +1,85 @@
+import asyncio
+from typing import List, Optional, Tuple
+from .models import ScoreManager, GameScore
+
+
+class ScoreBatcher:
+    """POST /score 요청을 모아서 한 번에 쓰는 그룹 커밋 큐
+
+    첫 점수가 들어온 뒤 ``max_delay_ms`` 가 지나거나 ``max_batch`` 건이 모이면
+    배치 전체를 한 번의 쓰기 + fsync 로 저장하고, 그 뒤에 각 요청의 future 를 완료한다.
+    저장은 스레드에서 실행되므로 이벤트 루프는 막히지 않는다.
+    """
+
+    def __init__(self, score_manager: ScoreManager, max_batch: int = 256, max_delay_ms: float = 2.0):
+        if max_batch < 1:
+            raise ValueError('max_batch 는 1 이상이어야 합니다')
+        self.score_manager = score_manager
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def submit(self, score: GameScore) -> GameScore:
+        """점수를 큐에 넣고 배치가 디스크에 반영될 때까지 기다림"""
+        if self._task is None:
+            await self.start()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((score, future))
+        return await future
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """큐에 남은 점수를 모두 저장한 뒤 종료"""
+        if self._task is None:
+            return
+        self._queue.put_nowait(None)
+        await self._task
+        self._task = None
+        self._queue = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+
+            batch = [item]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._commit(batch)
+
+    async def _commit(self, batch: List[Tuple[GameScore, asyncio.Future]]) -> None:
+        scores = [score for score, _ in batch]
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self.score_manager.add_scores, scores)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for score, future in batch:
+            if not future.done():
+                future.set_result(score)
@@ -0,0 +1,51 @@
+import bisect
+import heapq
+from itertools import islice
+from typing import List, Tuple, Iterable
+
+
+class LeaderboardIndex:
+    """상위 ``capacity`` 개 점수의 행 번호만 정렬된 상태로 유지하는 리더보드 인덱스
+
+    time 내림차순으로 정렬하고, 동점이면 먼저 기록된(행 번호가 작은) 점수가 앞에 온다
+    (기존 ``sorted(..., key=time, reverse=True)`` 의 안정 정렬과 같은 순서).
+    점수 객체는 들고 있지 않으므로 응답할 때 행 번호로 저장소에서 꺼낸다.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self._keys: List[Tuple[int, int]] = []  # (-time, 행 번호) 오름차순
+        self._seen = 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, time: int, row: int) -> None:
+        """점수 한 건 반영 - O(capacity), 순위 밖이면 O(1)"""
+        self._seen += 1
+        keys = self._keys
+        # 꽉 찬 상태에서 꼴찌 이하 점수는 바로 버린다 (행 번호가 더 크므로 동점도 밀린다)
+        if len(keys) >= self.capacity and -time >= keys[-1][0]:
+            return
+
+        bisect.insort(keys, (-time, row))
+        if len(keys) > self.capacity:
+            keys.pop()
+
+    def extend(self, times: Iterable[int], first_row: int) -> None:
+        """first_row 부터 이어지는 행들을 한 번에 반영"""
+        for row, time in enumerate(times, first_row):
+            self.add(time, row)
+
+    def merge(self, other: 'LeaderboardIndex') -> None:
+        """다른 인덱스의 행을 합침 (행 번호가 겹치지 않는 인덱스끼리)"""
+        self._keys = list(islice(heapq.merge(self._keys, other._keys), self.capacity))
+        self._seen += other._seen
+
+    def covers(self, limit: int, offset: int = 0) -> bool:
+        """요청한 구간을 인덱스만으로 답할 수 있는지 여부"""
+        return offset + limit <= self.capacity or self._seen <= self.capacity
+
+    def top(self, limit: int, offset: int = 0) -> List[int]:
+        """구간에 해당하는 행 번호"""
+        return [row for _, row in self._keys[offset:offset + limit]]
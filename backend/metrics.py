@@ -0,0 +1,177 @@
+import bisect
+import functools
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+CONTENT_TYPE = 'text/plain; version=0.0.4'  # Response 가 charset=utf-8 을 붙인다
+
+# 초 단위 - 0.1ms ~ 2.5s
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class Histogram:
+    """버킷별 개수만 세고, 출력할 때 Prometheus 형식의 누적 개수로 바꾼다"""
+
+    __slots__ = ('bounds', 'counts', 'total', 'count')
+
+    def __init__(self, bounds: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # 마지막 칸은 +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        # le 는 "이하" 이므로 value 와 같은 경계의 버킷에 넣는다
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def lines(self, name: str, labels: str) -> List[str]:
+        sep = ',' if labels else ''
+        lines = []
+        cumulative = 0
+        for bound, n in zip(self.bounds + (float('inf'),), self.counts):
+            cumulative += n
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            lines.append(f'{name}_bucket{{{labels}{sep}le="{le}"}} {cumulative}')
+        lines.append(f'{name}_sum{{{labels}}} {self.total}')
+        lines.append(f'{name}_count{{{labels}}} {self.count}')
+        return lines
+
+
+class Metrics:
+    """요청/내부 작업 지표를 모아 Prometheus 텍스트 형식으로 내보내는 레지스트리
+
+    기록은 락 한 번 + 딕셔너리 조회 + 리스트 증가뿐이라 운영 중에 켜 둬도 된다.
+    라벨 조합은 라우트 템플릿과 고정된 작업 이름뿐이라 개수가 늘어나지 않는다.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._requests: Dict[Tuple[str, str, int], int] = {}
+        self._latency: Dict[Tuple[str, str], Histogram] = {}
+        self._operations: Dict[str, Histogram] = {}
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float) -> None:
+        with self._lock:
+            key = (method, route, status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+            histogram = self._latency.get((method, route))
+            if histogram is None:
+                histogram = self._latency[(method, route)] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def observe_operation(self, operation: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._operations.get(operation)
+            if histogram is None:
+                histogram = self._operations[operation] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def timed(self, operation: str) -> 'Timer':
+        """``with metrics.timed('serialize'):`` 로 블록 실행 시간을 기록"""
+        return Timer(self, operation)
+
+    def operation_summary(self) -> Dict[str, Dict[str, float]]:
+        """작업별 횟수와 평균 시간(ms) - 벤치마크 결과에 함께 싣는 용도"""
+        with self._lock:
+            return {
+                operation: {
+                    'count': histogram.count,
+                    'mean_ms': round(histogram.total / histogram.count * 1000, 3) if histogram.count else 0.0,
+                }
+                for operation, histogram in sorted(self._operations.items())
+            }
+
+    def render(self, gauges: Iterable[Tuple[str, str, float]] = ()) -> str:
+        """지표 전체를 텍스트 형식으로 - gauges 는 (이름, 설명, 값) 목록"""
+        lines = []
+        with self._lock:
+            lines.append('# HELP dpb_http_requests_total 라우트/상태 코드별 요청 수')
+            lines.append('# TYPE dpb_http_requests_total counter')
+            for (method, route, status), n in sorted(self._requests.items()):
+                lines.append(f'dpb_http_requests_total{{method="{method}",route="{route}",status="{status}"}} {n}')
+
+            lines.append('# HELP dpb_http_request_duration_seconds 라우트별 응답 시간')
+            lines.append('# TYPE dpb_http_request_duration_seconds histogram')
+            for (method, route), histogram in sorted(self._latency.items()):
+                lines.extend(histogram.lines('dpb_http_request_duration_seconds',
+                                             f'method="{method}",route="{route}"'))
+
+            lines.append('# HELP dpb_operation_duration_seconds 저장소 읽기/쓰기, 인덱스, 직렬화 작업 시간')
+            lines.append('# TYPE dpb_operation_duration_seconds histogram')
+            for operation, histogram in sorted(self._operations.items()):
+                lines.extend(histogram.lines('dpb_operation_duration_seconds', f'operation="{operation}"'))
+
+        for name, description, value in gauges:
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} gauge')
+            lines.append(f'{name} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+class Timer:
+    __slots__ = ('metrics', 'operation', 'started')
+
+    def __init__(self, metrics: Metrics, operation: str):
+        self.metrics = metrics
+        self.operation = operation
+
+    def __enter__(self) -> 'Timer':
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.metrics.observe_operation(self.operation, time.perf_counter() - self.started)
+
+
+def timed_method(operation: str):
+    """``self.metrics`` 가 있으면 메서드 실행 시간을 operation 이름으로 기록하는 데코레이터"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            metrics: Optional[Metrics] = self.metrics
+            if metrics is None:
+                return method(self, *args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                metrics.observe_operation(operation, time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+class MetricsMiddleware:
+    """요청마다 라우트 템플릿/상태 코드/응답 시간을 기록하는 ASGI 미들웨어
+
+    BaseHTTPMiddleware 와 달리 응답 본문을 감싸지 않아 요청당 비용이 작다.
+    """
+
+    def __init__(self, app, metrics: Metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # 라우팅 후 scope 에 남는 route 의 경로 템플릿을 라벨로 쓴다 (없으면 other)
+            route = scope.get('route')
+            path = getattr(route, 'path', 'other')
+            self.metrics.observe_request(scope['method'], path, status, time.perf_counter() - started)
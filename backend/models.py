@@ -1,9 +1,13 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Dict, Any, Optional
-import json
-import os
+from typing import List, Dict, Any, Optional, Tuple
+import threading
 from pydantic import BaseModel
+from .leaderboard import LeaderboardIndex
+from .metrics import Metrics, timed_method
+from .stats import StatsAccumulator
+from .storage import create_store
+from .windows import WindowedAggregates
 
 
 @dataclass
@@ -47,6 +51,9 @@ class StatsResponse(BaseModel):
     best_time: int
     average_time: float
     total_clicks: int
+    p50_time: int = 0
+    p90_time: int = 0
+    p99_time: int = 0
 
 class HealthResponse(BaseModel):
     status: str
@@ -58,52 +65,155 @@ class SaveScoreResponse(BaseModel):
 
 
 class ScoreManager:
-    def __init__(self, filename: str = 'scores.json'):
-        self.filename = filename
-
+    def __init__(self, filename: Optional[str] = None, backend: str = 'json',
+                 fsync: str = 'interval', fsync_interval: float = 1.0,
+                 compact_threshold: int = 10000, leaderboard_size: int = 1000,
+                 window_retention_days: int = 35, window_retention_months: int = 24,
+                 metrics: Optional[Metrics] = None):
+        self.store = create_store(
+            backend,
+            filename,
+            fsync=fsync,
+            fsync_interval=fsync_interval,
+            compact_threshold=compact_threshold,
+        )
+        self.backend = backend
+        self.filename = self.store.filename
+        self.leaderboard_size = leaderboard_size
+        self.window_retention_days = window_retention_days
+        self.window_retention_months = window_retention_months
+        self.metrics = metrics  # 있으면 저장소 읽기/쓰기 시간을 기록
+        self._lock = threading.Lock()
+        self._leaderboard: Optional[LeaderboardIndex] = None
+        self._stats: Optional[StatsAccumulator] = None
+        self._windows: Optional[WindowedAggregates] = None
+        self._indexed = 0
+        self._generation = 0
+
+    @property
+    def version(self) -> int:
+        """점수가 추가될 때마다 커지는 저장소 버전 - 응답 캐시 키로 사용"""
+        self.store.refresh()
+        return self.store.version
+
+    def count(self) -> int:
+        self.store.refresh()
+        return self.store.count()
+
+    @timed_method('load')
     def load_scores(self) -> List[GameScore]:
-        if not os.path.exists(self.filename):
-            return []
-        
-        try:
-            with open(self.filename, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return [GameScore.from_dict(score_data) for score_data in data]
-        except (json.JSONDecodeError, FileNotFoundError):
-            return []
+        return [GameScore.from_dict(score_data) for score_data in self.store.records()]
 
+    @timed_method('replace')
     def save_scores(self, scores: List[GameScore]) -> None:
-        score_dicts = [score.to_dict() for score in scores]
-        with open(self.filename, 'w', encoding='utf-8') as f:
-            json.dump(score_dicts, f, ensure_ascii=False, indent=2)
+        with self._lock:
+            self.store.replace(score.to_dict() for score in scores)
+            self._reset_indexes()
 
+    @timed_method('append')
     def add_score(self, score: GameScore) -> GameScore:
-        scores = self.load_scores()
-        scores.append(score)
-        self.save_scores(scores)
+        self.store.append(score.to_dict())
+        if not self.store.indexed:
+            with self._lock:
+                # 다른 스레드/워커가 추가한 점수까지 함께 인덱스에 반영된다
+                self._sync_indexes(refresh=False)
         return score
 
-    def get_leaderboard(self, limit: int = 10) -> List[GameScore]:
-        scores = self.load_scores()
-        return sorted(scores, key=lambda x: x.time, reverse=True)[:limit]
-
-    def get_stats(self) -> Dict[str, Any]:
-        scores = self.load_scores()
-        
-        if not scores:
-            return {
-                'total_games': 0,
-                'best_time': 0,
-                'average_time': 0,
-                'total_clicks': 0
-            }
-        
-        times = [score.time for score in scores]
-        clicks = [score.clicks for score in scores]
-        
-        return {
-            'total_games': len(scores),
-            'best_time': max(times),
-            'average_time': round(sum(times) / len(times), 2),
-            'total_clicks': sum(clicks)
-        }
\ No newline at end of file
+    @timed_method('append_batch')
+    def add_scores(self, scores: List[GameScore]) -> List[GameScore]:
+        """여러 점수를 한 번에 저장하고 디스크까지 반영 (그룹 커밋용)"""
+        self.store.append_many((score.to_dict() for score in scores), sync=True)
+        if not self.store.indexed:
+            with self._lock:
+                self._sync_indexes(refresh=False)
+        return scores
+
+    def import_scores(self, path: str) -> int:
+        """기존 scores.json 형식 파일을 현재 저장소로 가져오기"""
+        with self._lock:
+            count = self.store.import_file(path)
+            self._reset_indexes()
+        return count
+
+    def close(self) -> None:
+        with self._lock:
+            self.store.close()
+            self._leaderboard = None
+            self._stats = None
+            self._windows = None
+
+    @timed_method('leaderboard')
+    def get_leaderboard(self, limit: int = 10, offset: int = 0,
+                        window: Optional[Tuple[int, int]] = None) -> List[GameScore]:
+        """window 는 ``resolve_window`` 가 돌려준 [시작, 끝) 구간 (None 이면 전체 기간)"""
+        if self.store.indexed:
+            return [GameScore.from_dict(data) for data in self.store.leaderboard(limit, offset, window)]
+
+        with self._lock:
+            self._sync_indexes()
+            if window is None:
+                rows = self._leaderboard.top(limit, offset) if self._leaderboard.covers(limit, offset) else None
+            else:
+                rows = self._windows.top(window[0], window[1], limit, offset)
+            if rows is not None:
+                # 응답에 나가는 행만 GameScore 로 만든다
+                return [GameScore.from_dict(self.store.row(i)) for i in rows]
+
+        # 인덱스 범위를 넘는 페이지는 저장소에서 직접 정렬
+        return [GameScore.from_dict(data) for data in self.store.leaderboard(limit, offset, window)]
+
+    @timed_method('stats')
+    def get_stats(self, window: Optional[Tuple[int, int]] = None) -> Dict[str, Any]:
+        if self.store.indexed:
+            return self.store.stats(window).to_stats()
+
+        with self._lock:
+            self._sync_indexes()
+            stats = self._stats if window is None else self._windows.stats(window[0], window[1])
+            if stats is not None:
+                return stats.to_stats()
+
+        # 기간별 버킷으로 답할 수 없는 구간은 저장소에서 직접 집계
+        return self.store.stats(window).to_stats()
+
+    def _sync_indexes(self, refresh: bool = True) -> None:
+        # 락을 쥔 상태에서 호출 - 처음(또는 저장소가 통째로 바뀐 뒤)에만 전체를 훑고 이후엔 새 점수만 반영
+        if refresh:
+            self.store.refresh()
+        if self._leaderboard is None or self._generation != self.store.generation:
+            self._build_indexes()
+            return
+
+        new_scores = self.store.columns(self._indexed)
+        self._leaderboard.extend(new_scores.times, self._indexed)
+        self._stats.add_many(new_scores.times, new_scores.clicks)
+        self._windows.add_many(new_scores.times, new_scores.clicks, new_scores.timestamps, self._indexed)
+        self._indexed += len(new_scores)
+
+    @timed_method('build_indexes')
+    def _build_indexes(self) -> None:
+        generation = self.store.generation
+        columns = self.store.columns()
+
+        leaderboard = LeaderboardIndex(self.leaderboard_size)
+        leaderboard.extend(columns.times, 0)
+
+        # 통계는 디스크의 실제 점수로 다시 계산한다 (백업 복원 등으로 파일이 바뀌어도 어긋나지 않게)
+        stats = StatsAccumulator()
+        stats.add_many(columns.times, columns.clicks)
+
+        windows = WindowedAggregates(self.leaderboard_size, self.window_retention_days,
+                                     self.window_retention_months)
+        windows.add_many(columns.times, columns.clicks, columns.timestamps, 0)
+
+        self._leaderboard = leaderboard
+        self._stats = stats
+        self._windows = windows
+        self._indexed = len(columns)
+        self._generation = generation
+
+    def _reset_indexes(self) -> None:
+        # 저장소 내용이 통째로 바뀌면 다음 조회 때 인덱스를 다시 만든다
+        self._leaderboard = None
+        self._stats = None
+        self._windows = None
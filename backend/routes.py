@@ -1,24 +1,70 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, HTTPException, Query, Depends, Request, Response
+from datetime import datetime
+from typing import List, Optional, Tuple
+import json
 from .models import ScoreManager, GameScore, ScoreRequest, ScoreResponse, StatsResponse, HealthResponse, SaveScoreResponse
+from .ingest import ScoreBatcher
+from .cache import ResponseCache
+from .metrics import Metrics, CONTENT_TYPE
+from .windows import resolve_window
 
 api = APIRouter()
-score_manager = ScoreManager()
+
+
+def get_score_manager(request: Request) -> ScoreManager:
+    """create_app() 에서 설정한 점수 관리자"""
+    return request.app.state.score_manager
+
+
+def get_score_batcher(request: Request) -> ScoreBatcher:
+    """create_app() 에서 설정한 점수 저장 큐"""
+    return request.app.state.score_batcher
+
+
+def get_response_cache(request: Request) -> ResponseCache:
+    """create_app() 에서 설정한 응답 캐시"""
+    return request.app.state.response_cache
+
+
+def get_metrics(request: Request) -> Metrics:
+    """create_app() 에서 설정한 지표 레지스트리"""
+    return request.app.state.metrics
+
+
+def get_window(window: str = Query('all', description='day, week, all'),
+               start: Optional[datetime] = Query(None, alias='from'),
+               end: Optional[datetime] = Query(None, alias='to')) -> Optional[Tuple[int, int]]:
+    """조회 기간 - from/to 를 주면 window 대신 그 구간 (날짜 단위로 맞춤)"""
+    try:
+        return resolve_window(window, start, end)
+    except (ValueError, OverflowError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @api.get('/leaderboard', response_model=List[ScoreResponse])
-def get_leaderboard():
-    """리더보드 조회 - 시간 순으로 정렬된 상위 점수들"""
+def get_leaderboard(request: Request, limit: int = Query(10, ge=1, le=100), offset: int = Query(0, ge=0),
+                    window: Optional[Tuple[int, int]] = Depends(get_window),
+                    score_manager: ScoreManager = Depends(get_score_manager),
+                    cache: ResponseCache = Depends(get_response_cache),
+                    metrics: Metrics = Depends(get_metrics)):
+    """리더보드 조회 - 시간 순으로 정렬된 상위 점수들 (offset 으로 페이지 이동, window/from/to 로 기간 지정)"""
     try:
-        scores = score_manager.get_leaderboard()
-        return [ScoreResponse(**score.to_dict()) for score in scores]
+        key = ('leaderboard', limit, offset, window, score_manager.version)
+        entry = cache.get(key)
+        if entry is None:
+            scores = score_manager.get_leaderboard(limit=limit, offset=offset, window=window)
+            with metrics.timed('serialize'):
+                body = [ScoreResponse(**score.to_dict()).model_dump() for score in scores]
+                body = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            entry = cache.put(key, body)
+        return cache.respond(request, entry)
     except Exception as e:
         raise HTTPException(status_code=500, detail='리더보드를 가져올 수 없습니다')
 
 
 @api.post('/score', response_model=SaveScoreResponse)
-def save_score(score_data: ScoreRequest):
-    """새로운 게임 점수 저장"""
+async def save_score(score_data: ScoreRequest, score_batcher: ScoreBatcher = Depends(get_score_batcher)):
+    """새로운 게임 점수 저장 - 다른 요청과 묶어서 한 번에 디스크에 기록"""
     try:
         # 입력 검증 강화
         if score_data.time < 0 or score_data.time > 86400:  # 24시간 제한
@@ -27,7 +73,7 @@ def save_score(score_data: ScoreRequest):
             raise HTTPException(status_code=400, detail='유효하지 않은 클릭 수입니다 (0-1000회)')
         
         new_score = GameScore(time=score_data.time, clicks=score_data.clicks)
-        saved_score = score_manager.add_score(new_score)
+        saved_score = await score_batcher.submit(new_score)
         
         return SaveScoreResponse(
             message='점수가 저장되었습니다!',
@@ -41,15 +87,35 @@ def save_score(score_data: ScoreRequest):
 
 
 @api.get('/stats', response_model=StatsResponse)
-def get_stats():
-    """게임 통계 정보 조회"""
+def get_stats(request: Request, window: Optional[Tuple[int, int]] = Depends(get_window),
+              score_manager: ScoreManager = Depends(get_score_manager),
+              cache: ResponseCache = Depends(get_response_cache),
+              metrics: Metrics = Depends(get_metrics)):
+    """게임 통계 정보 조회 (window/from/to 로 기간 지정)"""
     try:
-        stats = score_manager.get_stats()
-        return StatsResponse(**stats)
+        key = ('stats', window, score_manager.version)
+        entry = cache.get(key)
+        if entry is None:
+            stats = score_manager.get_stats(window=window)
+            with metrics.timed('serialize'):
+                body = StatsResponse(**stats).model_dump_json().encode('utf-8')
+            entry = cache.put(key, body)
+        return cache.respond(request, entry)
     except Exception as e:
         raise HTTPException(status_code=500, detail='통계를 가져올 수 없습니다')
 
 
+@api.get('/metrics', response_class=Response)
+def get_metrics_text(score_manager: ScoreManager = Depends(get_score_manager),
+                     metrics: Metrics = Depends(get_metrics)):
+    """Prometheus 텍스트 형식 지표 - 요청 수/응답 시간, 저장소 작업 시간, 점수 수, 저장 파일 크기"""
+    gauges = [
+        ('dpb_scores', '저장된 점수 수', score_manager.count()),
+        ('dpb_store_size_bytes', '저장소 데이터 파일 크기 (바이트)', score_manager.store.size_bytes()),
+    ]
+    return Response(content=metrics.render(gauges), media_type=CONTENT_TYPE)
+
+
 @api.get('/health', response_model=HealthResponse)
 def health_check():
     """서버 상태 확인"""
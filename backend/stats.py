@@ -0,0 +1,100 @@
+import math
+from collections import Counter
+from typing import Dict, Any, Sequence
+
+
+class StatsAccumulator:
+    """점수 전체를 들고 있지 않고 O(1) 로 갱신되는 누적 통계
+
+    생존 시간 분포는 초 단위 히스토그램(시간 -> 건수)으로 유지한다.
+    시간은 0~86400초로 검증되므로 히스토그램 크기는 점수 개수와 무관하게 제한되고,
+    백분위수도 근사가 아닌 정확한 값이 나온다.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0
+        self.best_time = 0
+        self.total_clicks = 0
+        self.histogram: Dict[int, int] = {}
+
+    def add(self, time: int, clicks: int) -> None:
+        self.count += 1
+        self.total_time += time
+        self.total_clicks += clicks
+        if time > self.best_time:
+            self.best_time = time
+        self.histogram[time] = self.histogram.get(time, 0) + 1
+
+    def add_many(self, times: Sequence[int], clicks: Sequence[int]) -> None:
+        """열 단위로 한 번에 반영 - sum/max/Counter 가 C 루프로 돈다"""
+        if not len(times):
+            return
+        self.count += len(times)
+        self.total_time += sum(times)
+        self.total_clicks += sum(clicks)
+        self.best_time = max(self.best_time, max(times))
+        for time, n in Counter(times).items():
+            self.histogram[time] = self.histogram.get(time, 0) + n
+
+    def merge(self, other: 'StatsAccumulator') -> None:
+        """다른 구간의 통계를 합침 - O(히스토그램 크기)"""
+        self.count += other.count
+        self.total_time += other.total_time
+        self.total_clicks += other.total_clicks
+        self.best_time = max(self.best_time, other.best_time)
+        for time, n in other.histogram.items():
+            self.histogram[time] = self.histogram.get(time, 0) + n
+
+    def quantile(self, q: float) -> int:
+        """nearest-rank 방식 백분위수 - O(서로 다른 시간 값 개수)"""
+        if self.count == 0:
+            return 0
+        rank = max(1, math.ceil(round(q * self.count, 6)))
+        seen = 0
+        for time in sorted(self.histogram):
+            seen += self.histogram[time]
+            if seen >= rank:
+                return time
+        return self.best_time
+
+    def to_stats(self) -> Dict[str, Any]:
+        if self.count == 0:
+            return {
+                'total_games': 0,
+                'best_time': 0,
+                'average_time': 0,
+                'total_clicks': 0,
+                'p50_time': 0,
+                'p90_time': 0,
+                'p99_time': 0
+            }
+
+        return {
+            'total_games': self.count,
+            'best_time': self.best_time,
+            'average_time': round(self.total_time / self.count, 2),
+            'total_clicks': self.total_clicks,
+            'p50_time': self.quantile(0.5),
+            'p90_time': self.quantile(0.9),
+            'p99_time': self.quantile(0.99)
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'total_time': self.total_time,
+            'best_time': self.best_time,
+            'total_clicks': self.total_clicks,
+            'histogram': {str(time): n for time, n in self.histogram.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'StatsAccumulator':
+        stats = cls()
+        stats.count = data.get('count', 0)
+        stats.total_time = data.get('total_time', 0)
+        stats.best_time = data.get('best_time', 0)
+        stats.total_clicks = data.get('total_clicks', 0)
+        stats.histogram = {int(time): n for time, n in data.get('histogram', {}).items()}
+        return stats
@@ -0,0 +1,976 @@
+import heapq
+import json
+import logging
+import mmap
+import os
+import sqlite3
+import struct
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from itertools import islice
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple
+from .columns import ScoreColumns, timestamp_to_micros, micros_to_timestamp
+from .stats import StatsAccumulator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+FSYNC_POLICIES = ('always', 'interval', 'never')
+
+logger = logging.getLogger(__name__)
+
+
+class ScoreStore:
+    """점수 저장소 인터페이스
+
+    ``indexed`` 가 True 인 저장소는 리더보드/통계를 직접 계산하고,
+    False 인 저장소는 ScoreManager 가 메모리 인덱스를 만들어 사용한다.
+    """
+
+    indexed = False
+    generation = 0
+
+    @property
+    def version(self) -> int:
+        """점수가 추가되거나 교체될 때마다 커지는 버전 (refresh 이후 값)"""
+        raise NotImplementedError
+
+    def count(self) -> int:
+        raise NotImplementedError
+
+    def columns(self, start: int = 0) -> ScoreColumns:
+        """start 번째 이후 점수 열 - 메모리 인덱스를 만들거나 증분 갱신할 때 사용 (refresh 하지 않음)"""
+        raise NotImplementedError
+
+    def row(self, i: int) -> Dict[str, Any]:
+        """i 번째 점수 한 건 - 응답에 실제로 나가는 행만 이렇게 꺼낸다"""
+        raise NotImplementedError
+
+    def records(self) -> List[Dict[str, Any]]:
+        self.refresh()
+        return list(self.columns().rows())
+
+    def refresh(self) -> None:
+        """다른 프로세스가 쓴 내용을 반영 (필요한 저장소만 구현)"""
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """점수 한 건 추가"""
+        self.append_many([record])
+
+    def append_many(self, records: Iterable[Dict[str, Any]], sync: bool = False) -> None:
+        """여러 건 추가 - sync=True 면 fsync 정책과 관계없이 디스크까지 반영한 뒤 반환"""
+        raise NotImplementedError
+
+    def replace(self, records: Iterable[Dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+    def leaderboard(self, limit: int, offset: int = 0,
+                    window: Optional[Tuple[int, int]] = None) -> List[Dict[str, Any]]:
+        """window 는 [시작, 끝) epoch 마이크로초 (None 이면 전체 기간)"""
+        self.refresh()
+        columns = self.columns()
+        times = columns.times
+        rows = heapq.nsmallest(offset + limit, _window_rows(columns, window), key=lambda i: (-times[i], i))
+        return [columns.row(i) for i in rows[offset:]]
+
+    def stats(self, window: Optional[Tuple[int, int]] = None) -> StatsAccumulator:
+        self.refresh()
+        columns = self.columns()
+        stats = StatsAccumulator()
+        if window is None:
+            stats.add_many(columns.times, columns.clicks)
+        else:
+            for i in _window_rows(columns, window):
+                stats.add(columns.times[i], columns.clicks[i])
+        return stats
+
+    def data_files(self) -> List[str]:
+        """저장소가 디스크에 쓰는 데이터 파일 경로 (잠금 파일 제외)"""
+        return [self.filename]
+
+    def size_bytes(self) -> int:
+        """데이터 파일 크기 합 - 아직 없는 파일은 0"""
+        size = 0
+        for path in self.data_files():
+            try:
+                size += os.path.getsize(path)
+            except OSError:
+                pass
+        return size
+
+    def import_file(self, path: str) -> int:
+        """기존 ``scores.json`` 형식 파일의 점수를 추가 (마이그레이션용)"""
+        records = _read_json_array(path)
+        self.append_many(records)
+        return len(records)
+
+    def close(self) -> None:
+        pass
+
+
+class FileLock:
+    """``fcntl.flock`` 기반 프로세스 간 잠금
+
+    잡을 때마다 파일을 새로 열기 때문에 같은 프로세스의 다른 스레드끼리도 서로 막힌다.
+    잠금 파일 내용에는 저장소 세대(generation) 번호와 로그 교체(rotation) 횟수를 ``"세대 교체"`` 로 기록한다.
+    ``fcntl`` 이 없는 환경(Windows)에서는 잠그지 않으므로 워커 하나로만 실행해야 한다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def acquire(self, shared: bool = False, blocking: bool = True) -> Optional[int]:
+        """잠금을 잡고 fd 반환 - blocking=False 에서 이미 잡혀 있으면 None"""
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            flags = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+            if not blocking:
+                flags |= fcntl.LOCK_NB
+            try:
+                fcntl.flock(fd, flags)
+            except BlockingIOError:
+                os.close(fd)
+                return None
+        return fd
+
+    def release(self, fd: int) -> None:
+        os.close(fd)  # 닫으면 flock 도 풀린다
+
+    @contextmanager
+    def hold(self, shared: bool = False) -> Iterator[int]:
+        fd = self.acquire(shared=shared)
+        try:
+            yield fd
+        finally:
+            self.release(fd)
+
+    @staticmethod
+    def read_counters(fd: int) -> Tuple[int, int]:
+        """(세대, 로그 교체 횟수) - 교체 횟수가 없는 이전 형식이면 0"""
+        fields = os.pread(fd, 64, 0).split()
+        generation = int(fields[0]) if fields else 0
+        rotation = int(fields[1]) if len(fields) > 1 else 0
+        return generation, rotation
+
+    @staticmethod
+    def write_counters(fd: int, generation: int, rotation: int) -> None:
+        os.ftruncate(fd, 0)
+        os.pwrite(fd, f'{generation} {rotation}'.encode(), 0)
+
+    @staticmethod
+    def read_generation(fd: int) -> int:
+        return FileLock.read_counters(fd)[0]
+
+    @staticmethod
+    def write_generation(fd: int, generation: int) -> None:
+        FileLock.write_counters(fd, generation, FileLock.read_counters(fd)[1])
+
+
+class ScoreLog(ScoreStore):
+    """스냅샷 + 추가 전용 로그(JSONL) 기반 점수 저장소
+
+    - 스냅샷: 기존 ``scores.json`` 과 같은 JSON 배열 형식이라 기존 파일이 그대로 스냅샷으로 읽힌다
+    - 로그: ``<스냅샷>.log`` 에 점수 한 건당 JSON 한 줄을 추가한다 (각 줄에 전체 순번 ``n`` 포함)
+    - 로그가 ``compact_threshold`` 건을 넘으면 백그라운드 스레드가 스냅샷으로 압축한다
+    - 시작 시 스냅샷 + 로그 꼬리를 재생해서 상태를 복구한다
+
+    여러 워커(프로세스)가 같은 파일을 써도 안전하다.
+    - 쓰기는 ``<스냅샷>.lock`` 배타 잠금 안에서 다른 워커가 추가한 로그를 먼저 따라 읽은 뒤 추가한다
+    - 읽기는 공유 잠금 안에서 로그 꼬리를 따라 읽어 메모리 상태를 최신으로 맞춘다
+    - 압축은 ``<스냅샷>.compact.lock`` 을 잡은 워커 하나만 수행한다
+    - ``replace`` 는 잠금 파일의 세대 번호를 올려 다른 워커가 전체를 다시 읽게 한다
+    - 로그를 새 파일로 바꿀 때마다 잠금 파일의 교체 횟수를 올린다. 읽던 로그 이후 교체가 두 번 이상
+      있었다면 중간 로그는 이미 스냅샷으로 들어갔으므로 스냅샷부터 다시 읽는다
+
+    fsync 정책:
+    - ``always``: 매 쓰기마다 fsync
+    - ``interval``: 마지막 fsync 이후 ``fsync_interval`` 초가 지난 첫 쓰기에서 fsync
+    - ``never``: flush 만 하고 fsync 는 OS 에 맡김
+    """
+
+    def __init__(self, filename: str = 'scores.json', fsync: str = 'interval',
+                 fsync_interval: float = 1.0, compact_threshold: int = 10000):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f'지원하지 않는 fsync 정책입니다: {fsync}')
+        self.filename = filename
+        self.log_filename = filename + '.log'
+        self.compacting_filename = filename + '.log.compacting'
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.compact_threshold = compact_threshold
+
+        self._lock = threading.Lock()
+        self._file_lock = FileLock(filename + '.lock')
+        self._compact_lock = FileLock(filename + '.compact.lock')
+        self._records: Optional[ScoreColumns] = None
+        self._generation = 0
+        self._rotation = 0  # 지금 열려 있는 로그의 교체 횟수
+        self._reader = None
+        self._writer = None
+        self._pending = b''
+        self._log_records = 0
+        self._last_fsync = 0.0
+        self._compactor: Optional[threading.Thread] = None
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    @property
+    def version(self) -> int:
+        # 세대가 바뀌면 레코드 수가 줄어도 버전은 커지도록 세대를 상위 비트에 둔다
+        with self._lock:
+            count = len(self._records) if self._records is not None else 0
+            return (self._generation << 40) + count
+
+    # ------------------------------------------------------------------ 조회/쓰기
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._records) if self._records is not None else 0
+
+    def data_files(self) -> List[str]:
+        return [self.filename, self.log_filename, self.compacting_filename]
+
+    def columns(self, start: int = 0) -> ScoreColumns:
+        with self._lock:
+            if self._records is None:
+                return ScoreColumns()
+            # 배열 조각은 복사본이라 이후 추가와 충돌하지 않는다
+            return self._records.slice(start)
+
+    def row(self, i: int) -> Dict[str, Any]:
+        with self._lock:
+            return self._records.row(i)
+
+    def records(self) -> List[Dict[str, Any]]:
+        """현재 저장된 모든 점수 레코드"""
+        with self._lock:
+            self._refresh()
+            return list(self._records.rows())
+
+    def refresh(self) -> None:
+        """다른 워커가 추가한 로그를 따라 읽기"""
+        with self._lock:
+            self._refresh()
+
+    def append_many(self, records: Iterable[Dict[str, Any]], sync: bool = False) -> None:
+        """여러 건을 한 번의 write + fsync 로 추가"""
+        records = list(records)
+        with self._lock, self._file_lock.hold() as fd:
+            self._catch_up(fd)
+            if self._pending:
+                # 다른 워커가 쓰다가 죽으면서 남긴 잘린 줄을 지운다
+                self._writer.truncate(self._reader.tell() - len(self._pending))
+                self._pending = b''
+
+            start = len(self._records)
+            lines = [
+                json.dumps({'n': start + i, **record}, ensure_ascii=False) + '\n'
+                for i, record in enumerate(records)
+            ]
+            self._writer.write(''.join(lines).encode('utf-8'))
+            self._writer.flush()
+            self._sync(force=sync)
+            # 방금 쓴 줄은 다시 읽지 않도록 읽기 위치를 끝으로 옮긴다
+            self._reader.seek(self._writer.tell())
+            for record in records:
+                self._records.append(record)
+            self._log_records += len(records)
+
+            if self._log_records >= self.compact_threshold:
+                self._start_compaction(fd)
+
+    def replace(self, records: Iterable[Dict[str, Any]]) -> None:
+        """전체 레코드를 교체 (스냅샷을 새로 쓰고 로그를 비움)"""
+        records = ScoreColumns.from_records(records)
+        # 잠금 순서: 압축 잠금 -> 프로세스 내부 잠금 -> 파일 잠금
+        self._wait_compaction()
+        compact_fd = self._compact_lock.acquire()
+        try:
+            with self._lock, self._file_lock.hold() as fd:
+                # 세대를 먼저 올려서 도중에 실패해도 다른 워커가 디스크 내용을 처음부터 다시 읽게 한다
+                generation, rotation = FileLock.read_counters(fd)
+                FileLock.write_counters(fd, generation + 1, rotation + 1)
+                self._write_snapshot(records)
+                self._remove_compacting()
+                self._new_log()
+                self._generation, self._rotation = generation + 1, rotation + 1
+                self._records = records
+                self._open_log()
+        finally:
+            self._compact_lock.release(compact_fd)
+
+    def close(self) -> None:
+        """남은 쓰기를 디스크에 반영하고 진행 중인 압축을 기다림"""
+        self._wait_compaction()
+        with self._lock:
+            if self._writer is not None:
+                self._sync(force=True)
+            self._close_log()
+            self._records = None
+
+    # ------------------------------------------------------------------ 내부 구현
+    # 아래 메서드는 모두 self._lock 을 쥔 상태에서 호출한다
+
+    def _refresh(self) -> None:
+        with self._file_lock.hold(shared=self._records is not None) as fd:
+            self._catch_up(fd)
+
+    def _catch_up(self, fd: int) -> None:
+        generation, rotation = FileLock.read_counters(fd)
+        if self._records is None or generation != self._generation:
+            self._load(fd)
+            return
+
+        self._read_tail()
+        if rotation == self._rotation:
+            return
+        if rotation > self._rotation + 1:
+            # 읽던 로그와 현재 로그 사이의 로그를 놓쳤다 - 그 내용은 스냅샷에 있다
+            self._load(fd)
+            return
+        # 로그가 한 번 바뀌었다 - 이전 파일은 위에서 끝까지 읽었으므로 새 파일로 넘어간다
+        self._open_log()
+        self._rotation = rotation
+        self._read_tail()
+
+    def _load(self, fd: int) -> None:
+        self._close_log()
+        self._generation, self._rotation = FileLock.read_counters(fd)
+        self._records = ScoreColumns.from_records(_read_json_array(self.filename))
+        if os.path.exists(self.compacting_filename):
+            # 압축 중이거나 압축이 끊긴 로그 - 스냅샷에 이미 들어간 레코드는 n 으로 걸러진다
+            with open(self.compacting_filename, 'rb') as f:
+                data = f.read()
+            self._apply_lines(data[:data.rfind(b'\n') + 1])
+        if not os.path.exists(self.log_filename):
+            self._new_log()
+        self._open_log()
+        self._read_tail()
+
+    def _open_log(self) -> None:
+        self._close_log()
+        self._writer = open(self.log_filename, 'ab')
+        self._reader = open(self.log_filename, 'rb')
+        self._pending = b''
+        self._log_records = 0
+
+    def _close_log(self) -> None:
+        for f in (self._writer, self._reader):
+            if f is not None:
+                f.close()
+        self._writer = None
+        self._reader = None
+
+    def _new_log(self) -> None:
+        # 제자리에서 비우지 않고 새 파일로 바꿔야 다른 워커가 inode 변화로 알아챈다
+        tmp_filename = f'{self.log_filename}.{os.getpid()}.tmp'
+        open(tmp_filename, 'wb').close()
+        os.replace(tmp_filename, self.log_filename)
+
+    def _read_tail(self) -> None:
+        data = self._pending + self._reader.read()
+        end = data.rfind(b'\n') + 1
+        self._pending = data[end:]
+        self._log_records += self._apply_lines(data[:end])
+
+    def _apply_lines(self, data: bytes) -> int:
+        applied = 0
+        for line in data.splitlines():
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            n = entry.pop('n', None)
+            if n is not None and n < len(self._records):
+                # 압축 도중 중단된 경우 스냅샷에 이미 반영된 레코드
+                continue
+            self._records.append(entry)
+            applied += 1
+        return applied
+
+    def _sync(self, force: bool = False) -> None:
+        if self.fsync == 'never' and not force:
+            return
+        now = time.monotonic()
+        if force or self.fsync == 'always' or now - self._last_fsync >= self.fsync_interval:
+            os.fsync(self._writer.fileno())
+            self._last_fsync = now
+
+    def _start_compaction(self, fd: int) -> None:
+        # 파일 잠금을 쥔 상태 - 현재 로그를 .compacting 으로 돌리고 새 로그를 연다
+        # 압축은 최선 노력이다. 점수는 이미 로그에 저장됐으므로 실패해도 쓰기는 성공으로 끝낸다
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        compact_fd = self._compact_lock.acquire(blocking=False)
+        if compact_fd is None:
+            return  # 다른 워커가 압축 중
+
+        try:
+            self._sync(force=True)
+            # 교체 횟수를 먼저 올린다 - 교체가 실패해도 다른 워커는 같은 로그를 다시 읽을 뿐이다 (n 으로 걸러짐)
+            generation, rotation = FileLock.read_counters(fd)
+            self._rotation = rotation + 1
+            FileLock.write_counters(fd, generation, self._rotation)
+            if os.path.exists(self.compacting_filename):
+                # 이전 압축이 끊겼다 - 현재 로그를 .compacting 뒤에 이어 붙이고 함께 압축한다
+                self._append_to_compacting()
+            else:
+                os.replace(self.log_filename, self.compacting_filename)
+            self._new_log()
+            self._open_log()
+        except Exception:
+            logger.exception('점수 로그 압축을 시작하지 못했습니다: %s', self.filename)
+            self._compact_lock.release(compact_fd)
+            # 매 쓰기마다 다시 시도하지 않도록 다음 임계치까지 미룬다
+            self._log_records = 0
+            return
+
+        # 배열을 복사해 두고 직렬화는 락 밖에서 한다
+        self._compactor = threading.Thread(
+            target=self._compact, args=(self._records.slice(), compact_fd), daemon=True
+        )
+        self._compactor.start()
+
+    def _compact(self, records: ScoreColumns, compact_fd: int) -> None:
+        # 실패하면 .compacting 이 남고, 다음 압축이 그 뒤에 로그를 이어 붙여 다시 시도한다
+        tmp_filename = None
+        try:
+            tmp_filename = write_json_array_atomic(self.filename, records.rows(), replace=False)
+            with self._lock, self._file_lock.hold():
+                os.replace(tmp_filename, self.filename)
+                tmp_filename = None
+                self._remove_compacting()
+        except Exception:
+            logger.exception('점수 스냅샷을 쓰지 못했습니다: %s', self.filename)
+        finally:
+            if tmp_filename is not None:
+                _remove_quietly(tmp_filename)
+            self._compact_lock.release(compact_fd)
+
+    def _append_to_compacting(self) -> None:
+        # 끊긴 줄은 잘라 내고 이어 붙인다 - 중복된 줄은 읽을 때 n 으로 걸러진다
+        with open(self.compacting_filename, 'r+b') as f:
+            data = f.read()
+            f.truncate(data.rfind(b'\n') + 1)
+            f.seek(0, os.SEEK_END)
+            with open(self.log_filename, 'rb') as log:
+                data = log.read()
+            f.write(data[:data.rfind(b'\n') + 1])
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _wait_compaction(self) -> None:
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+            self._compactor = None
+
+    def _remove_compacting(self) -> None:
+        if os.path.exists(self.compacting_filename):
+            os.remove(self.compacting_filename)
+
+    def _write_snapshot(self, records: ScoreColumns) -> None:
+        write_json_array_atomic(self.filename, records.rows())
+
+
+class SqliteScoreStore(ScoreStore):
+    """SQLite 기반 점수 저장소
+
+    - WAL 모드라 읽기가 쓰기를 막지 않는다
+    - ``time`` 인덱스로 리더보드를 정렬 없이 읽는다
+    - 트리거가 삽입마다 합계 행과 시간 히스토그램을 갱신해서 통계가 전체 스캔 없이 나온다
+    - 같은 트리거가 날짜별 합계/히스토그램도 갱신해서 기간별 통계는 걸친 날짜 수만큼만 읽는다
+    - 기간 리더보드는 날짜별 ``(날짜, time DESC, id)`` 인덱스에서 상위 행만 읽어 합친다
+    - SQL 은 모두 고정 문자열 + 파라미터라 sqlite3 의 statement 캐시로 재사용된다
+    """
+
+    indexed = True
+
+    SYNCHRONOUS = {'always': 'FULL', 'interval': 'NORMAL', 'never': 'OFF'}
+
+    SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS scores (
+            id INTEGER PRIMARY KEY,
+            time INTEGER NOT NULL,
+            clicks INTEGER NOT NULL,
+            timestamp TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_scores_time ON scores (time DESC, id);
+        CREATE INDEX IF NOT EXISTS idx_scores_day_time ON scores (substr(timestamp, 1, 10), time DESC, id);
+
+        CREATE TABLE IF NOT EXISTS score_totals (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            count INTEGER NOT NULL,
+            total_time INTEGER NOT NULL,
+            best_time INTEGER NOT NULL,
+            total_clicks INTEGER NOT NULL
+        );
+        INSERT OR IGNORE INTO score_totals VALUES (0, 0, 0, 0, 0);
+
+        CREATE TABLE IF NOT EXISTS time_histogram (
+            time INTEGER PRIMARY KEY,
+            count INTEGER NOT NULL
+        ) WITHOUT ROWID;
+
+        CREATE TABLE IF NOT EXISTS daily_totals (
+            day TEXT PRIMARY KEY,
+            count INTEGER NOT NULL,
+            total_time INTEGER NOT NULL,
+            best_time INTEGER NOT NULL,
+            total_clicks INTEGER NOT NULL
+        ) WITHOUT ROWID;
+
+        CREATE TABLE IF NOT EXISTS daily_histogram (
+            day TEXT NOT NULL,
+            time INTEGER NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (day, time)
+        ) WITHOUT ROWID;
+
+        CREATE TABLE IF NOT EXISTS score_meta (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            version INTEGER NOT NULL
+        );
+        INSERT OR IGNORE INTO score_meta VALUES (0, 0);
+
+        CREATE TRIGGER IF NOT EXISTS scores_bump_version AFTER INSERT ON scores BEGIN
+            UPDATE score_meta SET version = version + 1 WHERE id = 0;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS scores_after_insert AFTER INSERT ON scores BEGIN
+            UPDATE score_totals SET
+                count = count + 1,
+                total_time = total_time + NEW.time,
+                best_time = MAX(best_time, NEW.time),
+                total_clicks = total_clicks + NEW.clicks
+            WHERE id = 0;
+            INSERT INTO time_histogram (time, count) VALUES (NEW.time, 1)
+                ON CONFLICT (time) DO UPDATE SET count = count + 1;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS scores_daily_after_insert AFTER INSERT ON scores BEGIN
+            INSERT INTO daily_totals (day, count, total_time, best_time, total_clicks)
+                VALUES (substr(NEW.timestamp, 1, 10), 1, NEW.time, NEW.time, NEW.clicks)
+                ON CONFLICT (day) DO UPDATE SET
+                    count = count + 1,
+                    total_time = total_time + excluded.total_time,
+                    best_time = MAX(best_time, excluded.best_time),
+                    total_clicks = total_clicks + excluded.total_clicks;
+            INSERT INTO daily_histogram (day, time, count) VALUES (substr(NEW.timestamp, 1, 10), NEW.time, 1)
+                ON CONFLICT (day, time) DO UPDATE SET count = count + 1;
+        END;
+    '''
+
+    # 날짜별 테이블이 생기기 전에 만들어진 DB 는 처음 연결할 때 한 번 채운다
+    BACKFILL_DAILY_SQL = '''
+        BEGIN IMMEDIATE;
+        DELETE FROM daily_totals;
+        DELETE FROM daily_histogram;
+        INSERT INTO daily_totals
+            SELECT substr(timestamp, 1, 10), COUNT(*), SUM(time), MAX(time), SUM(clicks)
+            FROM scores GROUP BY 1;
+        INSERT INTO daily_histogram
+            SELECT substr(timestamp, 1, 10), time, COUNT(*) FROM scores GROUP BY 1, 2;
+        COMMIT;
+    '''
+
+    INSERT_SQL = 'INSERT INTO scores (time, clicks, timestamp) VALUES (?, ?, ?)'
+    SELECT_ALL_SQL = 'SELECT time, clicks, timestamp FROM scores ORDER BY id'
+    LEADERBOARD_SQL = (
+        'SELECT time, clicks, timestamp FROM scores ORDER BY time DESC, id LIMIT ? OFFSET ?'
+    )
+    # 기간 리더보드는 날짜마다 인덱스 순서대로 상위 offset+limit 건만 읽어서 합친다 (정렬 없음)
+    WINDOW_DAYS_SQL = 'SELECT day FROM daily_totals WHERE day >= ? AND day < ? ORDER BY day'
+    DAY_LEADERBOARD_SQL = (
+        'SELECT time, clicks, timestamp, id FROM scores '
+        'WHERE substr(timestamp, 1, 10) = ? ORDER BY time DESC, id LIMIT ?'
+    )
+    TOTALS_SQL = 'SELECT count, total_time, best_time, total_clicks FROM score_totals WHERE id = 0'
+    HISTOGRAM_SQL = 'SELECT time, count FROM time_histogram'
+    DAILY_TOTALS_SQL = (
+        'SELECT COALESCE(SUM(count), 0), COALESCE(SUM(total_time), 0), '
+        'COALESCE(MAX(best_time), 0), COALESCE(SUM(total_clicks), 0) '
+        'FROM daily_totals WHERE day >= ? AND day < ?'
+    )
+    DAILY_HISTOGRAM_SQL = 'SELECT time, SUM(count) FROM daily_histogram WHERE day >= ? AND day < ? GROUP BY time'
+    DAILY_COUNT_SQL = 'SELECT COALESCE(SUM(count), 0) FROM daily_totals'
+    VERSION_SQL = 'SELECT version FROM score_meta WHERE id = 0'
+
+    def __init__(self, filename: str = 'scores.db', fsync: str = 'interval'):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f'지원하지 않는 fsync 정책입니다: {fsync}')
+        self.filename = filename
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def version(self) -> int:
+        with self._lock:
+            return self._connect().execute(self.VERSION_SQL).fetchone()[0]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._connect().execute(self.TOTALS_SQL).fetchone()[0]
+
+    def data_files(self) -> List[str]:
+        return [self.filename, self.filename + '-wal']
+
+    def records(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._connect().execute(self.SELECT_ALL_SQL).fetchall()
+        return [_row_to_record(row) for row in rows]
+
+    def append_many(self, records: Iterable[Dict[str, Any]], sync: bool = False) -> None:
+        rows = [(r['time'], r['clicks'], r['timestamp']) for r in records]
+        with self._lock:
+            conn = self._connect()
+            full = sync and self.fsync != 'always'
+            if full:
+                # 이번 커밋만 WAL 을 fsync 하도록 잠시 FULL 로 올린다
+                conn.execute('PRAGMA synchronous=FULL')
+            try:
+                with conn:
+                    conn.executemany(self.INSERT_SQL, rows)
+            finally:
+                if full:
+                    conn.execute(f'PRAGMA synchronous={self.SYNCHRONOUS[self.fsync]}')
+
+    def replace(self, records: Iterable[Dict[str, Any]]) -> None:
+        rows = [(r['time'], r['clicks'], r['timestamp']) for r in records]
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute('DELETE FROM scores')
+                conn.execute('UPDATE score_totals SET count = 0, total_time = 0, '
+                             'best_time = 0, total_clicks = 0 WHERE id = 0')
+                conn.execute('DELETE FROM time_histogram')
+                conn.execute('DELETE FROM daily_totals')
+                conn.execute('DELETE FROM daily_histogram')
+                conn.execute('UPDATE score_meta SET version = version + 1 WHERE id = 0')
+                conn.executemany(self.INSERT_SQL, rows)
+
+    def leaderboard(self, limit: int, offset: int = 0,
+                    window: Optional[Tuple[int, int]] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            conn = self._connect()
+            if window is None:
+                rows = conn.execute(self.LEADERBOARD_SQL, (limit, offset)).fetchall()
+            else:
+                # 비용은 걸친 날짜 수 x (offset + limit) - 구간 안의 점수 수와 무관하다
+                days = [day for day, in conn.execute(self.WINDOW_DAYS_SQL, _window_days(window))]
+                per_day = [conn.execute(self.DAY_LEADERBOARD_SQL, (day, offset + limit)).fetchall()
+                           for day in days]
+                merged = heapq.merge(*per_day, key=lambda row: (-row[0], row[3]))
+                rows = list(islice(merged, offset, offset + limit))
+        return [_row_to_record(row) for row in rows]
+
+    def stats(self, window: Optional[Tuple[int, int]] = None) -> StatsAccumulator:
+        with self._lock:
+            conn = self._connect()
+            if window is None:
+                count, total_time, best_time, total_clicks = conn.execute(self.TOTALS_SQL).fetchone()
+                histogram = dict(conn.execute(self.HISTOGRAM_SQL).fetchall())
+            else:
+                days = _window_days(window)
+                count, total_time, best_time, total_clicks = conn.execute(self.DAILY_TOTALS_SQL, days).fetchone()
+                histogram = dict(conn.execute(self.DAILY_HISTOGRAM_SQL, days).fetchall())
+
+        stats = StatsAccumulator()
+        stats.count = count
+        stats.total_time = total_time
+        stats.best_time = best_time
+        stats.total_clicks = total_clicks
+        stats.histogram = histogram
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        # 락을 쥔 상태에서 호출 - 연결 하나를 스레드 간에 공유한다
+        if self._conn is None:
+            # 다른 워커가 쓰는 중이면 busy_timeout 동안 기다린다
+            conn = sqlite3.connect(self.filename, timeout=30, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(f'PRAGMA synchronous={self.SYNCHRONOUS[self.fsync]}')
+            conn.executescript(self.SCHEMA)
+            if conn.execute(self.DAILY_COUNT_SQL).fetchone()[0] != conn.execute(self.TOTALS_SQL).fetchone()[0]:
+                conn.executescript(self.BACKFILL_DAILY_SQL)
+            self._conn = conn
+        return self._conn
+
+
+class BinaryScoreStore(ScoreStore):
+    """고정 폭 바이너리 점수 저장소 - mmap 으로 복사 없이 읽는다
+
+    파일 = 16바이트 헤더 (``DPBSCORE`` + 형식 버전 + 레코드 크기) + 레코드 배열
+    레코드 = time int32, clicks int32, timestamp int64 (epoch 마이크로초), 리틀 엔디언 16바이트
+
+    - 파일을 mmap 하고 memoryview 를 열 단위로 잘라 보기 때문에 점수 수와 관계없이 바로 열린다
+    - 추가는 파일 끝에 레코드를 붙이기만 하고, 다른 워커가 붙인 레코드는 파일 크기로 알아챈다
+    - 잠금/세대 번호는 ScoreLog 와 같은 ``<파일>.lock`` 방식을 쓴다
+    """
+
+    HEADER = struct.Struct('<8sII')
+    MAGIC = b'DPBSCORE'
+    FORMAT_VERSION = 1
+    RECORD = struct.Struct('<iiq')
+
+    def __init__(self, filename: str = 'scores.bin', fsync: str = 'interval', fsync_interval: float = 1.0):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f'지원하지 않는 fsync 정책입니다: {fsync}')
+        if sys.byteorder != 'little':
+            # memoryview.cast 는 네이티브 바이트 순서로 읽는다
+            raise RuntimeError('바이너리 저장소는 리틀 엔디언 환경에서만 사용할 수 있습니다')
+        self.filename = filename
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+
+        self._lock = threading.Lock()
+        self._file_lock = FileLock(filename + '.lock')
+        self._file = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._columns: Optional[ScoreColumns] = None
+        self._generation = 0
+        self._last_fsync = 0.0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    @property
+    def version(self) -> int:
+        with self._lock:
+            count = len(self._columns) if self._columns is not None else 0
+            return (self._generation << 40) + count
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._columns) if self._columns is not None else 0
+
+    def columns(self, start: int = 0) -> ScoreColumns:
+        with self._lock:
+            if self._columns is None:
+                return ScoreColumns()
+            return self._columns.slice(start)
+
+    def row(self, i: int) -> Dict[str, Any]:
+        with self._lock:
+            return self._columns.row(i)
+
+    def refresh(self) -> None:
+        with self._lock:
+            self._refresh()
+
+    def append_many(self, records: Iterable[Dict[str, Any]], sync: bool = False) -> None:
+        data = b''.join(self._pack(record) for record in records)
+        with self._lock, self._file_lock.hold() as fd:
+            self._catch_up(fd)
+            end = self.HEADER.size + len(self._columns) * self.RECORD.size
+            if os.fstat(self._file.fileno()).st_size > end:
+                # 다른 워커가 쓰다가 죽으면서 남긴 잘린 레코드를 지운다
+                self._file.truncate(end)
+            self._file.seek(end)
+            self._file.write(data)
+            self._file.flush()
+            self._sync(force=sync)
+            self._map(len(self._columns) + len(data) // self.RECORD.size)
+
+    def replace(self, records: Iterable[Dict[str, Any]]) -> None:
+        data = b''.join(self._pack(record) for record in records)
+        with self._lock, self._file_lock.hold() as fd:
+            self._create(data)
+            FileLock.write_generation(fd, FileLock.read_generation(fd) + 1)
+            self._open(fd)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._sync(force=True)
+                self._file.close()
+                self._file = None
+            self._columns = None
+            self._unmap()
+
+    # ------------------------------------------------------------------ 내부 구현
+    # 아래 메서드는 모두 self._lock 을 쥔 상태에서 호출한다
+
+    def _pack(self, record: Dict[str, Any]) -> bytes:
+        return self.RECORD.pack(
+            record.get('time', 0),
+            record.get('clicks', 0),
+            timestamp_to_micros(record.get('timestamp')),
+        )
+
+    def _refresh(self) -> None:
+        with self._file_lock.hold(shared=self._columns is not None) as fd:
+            self._catch_up(fd)
+
+    def _catch_up(self, fd: int) -> None:
+        if self._columns is None or FileLock.read_generation(fd) != self._generation:
+            self._open(fd)
+            return
+        size = os.fstat(self._file.fileno()).st_size
+        count = (size - self.HEADER.size) // self.RECORD.size
+        if count != len(self._columns):
+            self._map(count)
+
+    def _open(self, fd: int) -> None:
+        if self._file is not None:
+            self._file.close()
+        if not os.path.exists(self.filename):
+            self._create(b'')
+        self._file = open(self.filename, 'r+b')
+        magic, version, record_size = self.HEADER.unpack(self._file.read(self.HEADER.size))
+        if magic != self.MAGIC or version != self.FORMAT_VERSION or record_size != self.RECORD.size:
+            raise ValueError(f'점수 파일 형식이 올바르지 않습니다: {self.filename}')
+        self._generation = FileLock.read_generation(fd)
+        size = os.fstat(self._file.fileno()).st_size
+        self._map((size - self.HEADER.size) // self.RECORD.size)
+
+    def _create(self, data: bytes) -> None:
+        tmp_filename = f'{self.filename}.{os.getpid()}.tmp'
+        with open(tmp_filename, 'wb') as f:
+            f.write(self.HEADER.pack(self.MAGIC, self.FORMAT_VERSION, self.RECORD.size))
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_filename, self.filename)
+
+    def _map(self, count: int) -> None:
+        # 이전 mmap 위의 뷰를 아직 쓰는 곳이 있을 수 있으므로 닫지 않고 GC 에 맡긴다
+        self._mmap = None
+        if count == 0:
+            self._columns = ScoreColumns()
+            return
+        self._mmap = mmap.mmap(self._file.fileno(), self.HEADER.size + count * self.RECORD.size,
+                               access=mmap.ACCESS_READ)
+        body = memoryview(self._mmap)[self.HEADER.size:]
+        ints = body.cast('i')
+        longs = body.cast('q')
+        # 레코드 하나 = int32 4칸 = int64 2칸 -> 간격을 두고 잘라 열 뷰를 만든다
+        self._columns = ScoreColumns(ints[0::4], ints[1::4], longs[1::2])
+
+    def _unmap(self) -> None:
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass  # 밖에서 아직 뷰를 쥐고 있으면 GC 가 정리한다
+            self._mmap = None
+
+    def _sync(self, force: bool = False) -> None:
+        if self.fsync == 'never' and not force:
+            return
+        now = time.monotonic()
+        if force or self.fsync == 'always' or now - self._last_fsync >= self.fsync_interval:
+            os.fsync(self._file.fileno())
+            self._last_fsync = now
+
+
+BACKENDS = ('json', 'sqlite', 'binary')
+
+
+def create_store(backend: str = 'json', filename: Optional[str] = None, fsync: str = 'interval',
+                 fsync_interval: float = 1.0, compact_threshold: int = 10000) -> ScoreStore:
+    """설정 값으로 점수 저장소 생성"""
+    if backend == 'json':
+        return ScoreLog(
+            filename or 'scores.json',
+            fsync=fsync,
+            fsync_interval=fsync_interval,
+            compact_threshold=compact_threshold,
+        )
+    if backend == 'sqlite':
+        return SqliteScoreStore(filename or 'scores.db', fsync=fsync)
+    if backend == 'binary':
+        return BinaryScoreStore(filename or 'scores.bin', fsync=fsync, fsync_interval=fsync_interval)
+    raise ValueError(f'지원하지 않는 저장소입니다: {backend}')
+
+
+def _row_to_record(row) -> Dict[str, Any]:
+    return {'time': row[0], 'clicks': row[1], 'timestamp': row[2]}
+
+
+def _window_rows(columns: ScoreColumns, window: Optional[Tuple[int, int]]) -> Iterable[int]:
+    if window is None:
+        return range(len(columns))
+    start, end = window
+    timestamps = columns.timestamps
+    return (i for i in range(len(columns)) if start <= timestamps[i] < end)
+
+
+def _window_days(window: Tuple[int, int]) -> Tuple[str, str]:
+    # 구간은 날짜 경계에 맞춰져 있으므로 [시작 날짜, 끝 날짜) 문자열 비교로 충분하다
+    start, end = window
+    return micros_to_timestamp(start)[:10], micros_to_timestamp(end)[:10]
+
+
+def write_json_atomic(path: str, data: Any, replace: bool = True) -> str:
+    """임시 파일에 쓰고 rename 해서 반쯤 쓰인 파일이 보이지 않게 저장
+
+    replace=False 면 rename 하지 않고 임시 파일 경로만 돌려준다 (호출자가 잠금 안에서 교체).
+    """
+    def write(f):
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    return _write_atomic(path, write, replace)
+
+
+def write_json_array_atomic(path: str, rows: Iterable[Any], replace: bool = True) -> str:
+    """write_json_atomic 과 같지만 행을 하나씩 흘려 써서 전체 목록을 메모리에 만들지 않음"""
+    def write(f):
+        f.write('[')
+        for i, row in enumerate(rows):
+            if i:
+                f.write(',')
+            f.write(json.dumps(row, ensure_ascii=False, separators=(',', ':')))
+        f.write(']')
+    return _write_atomic(path, write, replace)
+
+
+def _write_atomic(path: str, write, replace: bool) -> str:
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        if replace:
+            os.replace(tmp_path, path)
+    except BaseException:
+        _remove_quietly(tmp_path)
+        raise
+    return tmp_path
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def read_json(path: str) -> Optional[Any]:
+    """JSON 파일 읽기 - 없거나 손상됐으면 None"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _read_json_array(path: str) -> List[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return []
+    # 손상된 스냅샷을 빈 목록으로 취급하면 다음 압축에서 덮어쓰게 되므로 예외를 그대로 올린다
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,176 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+from .columns import timestamp_to_micros, EPOCH
+from .leaderboard import LeaderboardIndex
+from .stats import StatsAccumulator
+
+DAY_MICROS = 86400 * 10 ** 6
+WINDOWS = ('day', 'week', 'all')
+MAX_DATETIME = datetime(9999, 12, 31)
+MAX_MICROS = (MAX_DATETIME - EPOCH) // timedelta(microseconds=1)
+
+
+def resolve_window(window: str = 'all', start: Optional[datetime] = None,
+                   end: Optional[datetime] = None, now: Optional[datetime] = None) -> Optional[Tuple[int, int]]:
+    """기간 파라미터 -> [시작, 끝) epoch 마이크로초 (전체 기간이면 None)
+
+    - day: 오늘 0시부터, week: 이번 주 월요일 0시부터 (로컬 시각, 점수 timestamp 와 같은 기준)
+    - start/end 를 주면 window 대신 그 구간을 쓴다 (end 는 포함하지 않음)
+    - 구간은 일별 버킷에 맞춰 시작은 그날 0시로 내리고 끝은 다음 날 0시로 올린다
+    """
+    if start is not None or end is not None:
+        # 시간대가 있는 값과 없는 값이 섞여도 비교할 수 있도록 로컬 마이크로초로 바꾼 뒤 비교한다
+        start_micros = _to_micros(start) if start is not None else 0
+        end_micros = _to_micros(end) if end is not None else MAX_MICROS
+        if start_micros >= end_micros:
+            raise ValueError('from 은 to 보다 앞선 시각이어야 합니다')
+        # 끝을 올리면 9999-12-31 이후가 될 수 있으므로 MAX_DATETIME 에서 자른다
+        return (start_micros // DAY_MICROS * DAY_MICROS,
+                min(-(-end_micros // DAY_MICROS) * DAY_MICROS, MAX_MICROS))
+
+    if window not in WINDOWS:
+        raise ValueError(f'지원하지 않는 기간입니다: {window}')
+    if window == 'all':
+        return None
+
+    today = (now or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+    first = today if window == 'day' else today - timedelta(days=today.weekday())
+    last = today + timedelta(days=1)
+    return _to_micros(first), _to_micros(last)
+
+
+def _to_micros(dt: datetime) -> int:
+    return timestamp_to_micros(dt.isoformat())
+
+
+class Bucket:
+    """한 기간(하루 또는 한 달)의 통계 + 상위 K 행 번호"""
+
+    __slots__ = ('stats', 'top', 'first_day', 'last_day')
+
+    def __init__(self, capacity: int, first_day: int, last_day: int):
+        self.stats = StatsAccumulator()
+        self.top = LeaderboardIndex(capacity)
+        self.first_day = first_day
+        self.last_day = last_day
+
+    def merge(self, other: 'Bucket') -> None:
+        self.stats.merge(other.stats)
+        self.top.merge(other.top)
+        self.first_day = min(self.first_day, other.first_day)
+        self.last_day = max(self.last_day, other.last_day)
+
+
+class WindowedAggregates:
+    """일별 버킷에 통계와 상위 K 를 미리 모아 두는 기간별 집계
+
+    - 점수가 들어오면 해당 날짜 버킷의 통계/상위 K 만 갱신한다
+    - 가장 최근 날짜보다 ``retention_days`` 일 넘게 지난 일별 버킷은 월별 버킷으로 합친다
+    - 월별 버킷은 ``retention_months`` 개월이 지나면 버린다 (전체 기간은 전역 인덱스가 담당)
+    - 조회 비용은 구간에 걸친 버킷 수에만 비례한다
+    - 월별 버킷을 일부만 덮거나 이미 버린 기간에 걸치는 구간은 None 을 돌려주고,
+      호출자가 저장소를 직접 훑는다
+    """
+
+    def __init__(self, capacity: int = 1000, retention_days: int = 35, retention_months: int = 24):
+        self.capacity = capacity
+        self.retention_days = retention_days
+        self.retention_months = retention_months
+        self._days: Dict[int, Bucket] = {}
+        self._months: Dict[int, Bucket] = {}
+        self._latest_day: Optional[int] = None
+        self._horizon_day: Optional[int] = None  # 이 날짜 이전은 버려졌을 수 있음
+
+    def add_many(self, times: Sequence[int], clicks: Sequence[int], timestamps: Sequence[int],
+                 first_row: int) -> None:
+        for row, (time, click, timestamp) in enumerate(zip(times, clicks, timestamps), first_row):
+            bucket = self._bucket(timestamp // DAY_MICROS)
+            if bucket is not None:
+                bucket.stats.add(time, click)
+                bucket.top.add(time, row)
+
+    def stats(self, start: int, end: int) -> Optional[StatsAccumulator]:
+        """구간 통계 - 버킷만으로 정확히 답할 수 없으면 None"""
+        buckets = self._buckets(start, end)
+        if buckets is None:
+            return None
+        stats = StatsAccumulator()
+        for bucket in buckets:
+            stats.merge(bucket.stats)
+        return stats
+
+    def top(self, start: int, end: int, limit: int, offset: int = 0) -> Optional[List[int]]:
+        """구간 상위 행 번호 - 어느 버킷이든 요청 구간을 다 담지 못하면 None"""
+        buckets = self._buckets(start, end)
+        if buckets is None:
+            return None
+        merged = LeaderboardIndex(offset + limit)
+        for bucket in buckets:
+            if not bucket.top.covers(limit, offset):
+                return None
+            merged.merge(bucket.top)
+        return merged.top(limit, offset)
+
+    def _buckets(self, start: int, end: int) -> Optional[List[Bucket]]:
+        # 구간에 걸친 버킷 - 구간 밖 날짜가 섞인 버킷이 있거나 버린 기간에 걸치면 None
+        first_day = start // DAY_MICROS
+        last_day = (end - 1) // DAY_MICROS
+        if self._horizon_day is not None and first_day < self._horizon_day:
+            return None
+        buckets = []
+        for bucket in list(self._days.values()) + list(self._months.values()):
+            if bucket.first_day > last_day or bucket.last_day < first_day:
+                continue
+            if bucket.first_day < first_day or bucket.last_day > last_day:
+                return None
+            buckets.append(bucket)
+        return buckets
+
+    def _bucket(self, day: int) -> Optional[Bucket]:
+        bucket = self._days.get(day)
+        if bucket is not None:
+            return bucket
+
+        if self._latest_day is None or day > self._latest_day:
+            self._latest_day = day
+            self._roll_up()
+        if day >= self._latest_day - self.retention_days:
+            bucket = self._days[day] = Bucket(self.capacity, day, day)
+            return bucket
+
+        # 이미 월별로 합쳐진 오래된 날짜의 점수
+        month = _month_of(day)
+        if month < _month_of(self._latest_day) - self.retention_months:
+            self._horizon_day = _first_day_of(_month_of(self._latest_day) - self.retention_months)
+            return None
+        bucket = self._months.get(month)
+        if bucket is None:
+            bucket = self._months[month] = Bucket(self.capacity, day, day)
+        bucket.first_day = min(bucket.first_day, day)
+        bucket.last_day = max(bucket.last_day, day)
+        return bucket
+
+    def _roll_up(self) -> None:
+        cutoff = self._latest_day - self.retention_days
+        for day in [day for day in self._days if day < cutoff]:
+            bucket = self._days.pop(day)
+            month = self._months.get(_month_of(day))
+            if month is None:
+                self._months[_month_of(day)] = bucket
+            else:
+                month.merge(bucket)
+
+        oldest_month = _month_of(self._latest_day) - self.retention_months
+        for month in [month for month in self._months if month < oldest_month]:
+            del self._months[month]
+            self._horizon_day = _first_day_of(oldest_month)
+
+
+def _month_of(day: int) -> int:
+    date = EPOCH + timedelta(days=day)
+    return date.year * 12 + date.month - 1
+
+
+def _first_day_of(month: int) -> int:
+    year, index = divmod(month, 12)
+    return (datetime(year, index + 1, 1) - EPOCH).days
@@ -0,0 +1,193 @@
+"""API 부하 벤치마크 - create_app() 을 프로세스 안에서 띄우고 비동기 클라이언트로 요청을 보낸다
+
+    python -m benchmarks.bench_api
+    python -m benchmarks.bench_api --scores 1000000 --requests 20000 --concurrency 128 --backend sqlite
+    python -m benchmarks.bench_api --mix leaderboard=1 --output before.json
+
+임시 디렉터리 저장소에 합성 점수 ``--scores`` 건(최근 60일에 고르게 분포)을 넣고,
+httpx.ASGITransport 로 네트워크 없이 앱을 호출한다. ``--mix`` 는 시나리오별 가중치다.
+
+- leaderboard: GET /leaderboard
+- page: GET /leaderboard?limit=100&offset=...
+- week: GET /leaderboard?window=week
+- stats: GET /stats
+- score: POST /score
+
+결과는 JSON 한 줄 - 커밋, 설정, 전체/시나리오별 처리량과 지연 p50/p90/p99/max(ms),
+그리고 서버 쪽 작업별(저장소 읽기/쓰기, 직렬화 등) 평균 시간.
+같은 옵션으로 커밋마다 실행해서 결과를 비교한다.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import httpx
+
+from backend.models import ScoreManager, GameScore
+from server import create_app
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FILENAMES = {'json': 'scores.json', 'sqlite': 'scores.db', 'binary': 'scores.bin'}
+
+
+def scenario_request(name: str, rng: random.Random):
+    """시나리오 이름 -> (메서드, 경로, JSON 본문)"""
+    if name == 'leaderboard':
+        return 'GET', '/leaderboard', None
+    if name == 'page':
+        return 'GET', f'/leaderboard?limit=100&offset={rng.randrange(0, 2000, 100)}', None
+    if name == 'week':
+        return 'GET', '/leaderboard?window=week', None
+    if name == 'stats':
+        return 'GET', '/stats', None
+    if name == 'score':
+        return 'POST', '/score', {'time': rng.randint(0, 600), 'clicks': rng.randint(1, 20)}
+    raise ValueError(f'알 수 없는 시나리오입니다: {name}')
+
+
+def parse_mix(mix: str):
+    weights = {}
+    for part in mix.split(','):
+        name, _, weight = part.partition('=')
+        scenario_request(name, random.Random())  # 이름 검증
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def percentile(samples, q: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+
+def summarize(latencies, errors: int, elapsed: float) -> dict:
+    if not latencies:
+        return {'requests': 0, 'errors': errors}
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.5) * 1000, 3),
+        'p90_ms': round(percentile(latencies, 0.9) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        'max_ms': round(max(latencies) * 1000, 3),
+    }
+
+
+def seed_scores(manager: ScoreManager, count: int, seed: int) -> None:
+    rng = random.Random(seed)
+    now = datetime.now()
+    span = 60 * 86400
+    manager.save_scores([
+        GameScore(
+            time=rng.randint(0, 600),
+            clicks=rng.randint(1, 20),
+            timestamp=(now - timedelta(seconds=rng.randrange(span))).isoformat(),
+        )
+        for _ in range(count)
+    ])
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+async def run(app, weights: dict, requests: int, warmup: int, concurrency: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    names = list(weights)
+    plan = rng.choices(names, weights=[weights[name] for name in names], k=warmup + requests)
+    results = {name: ([], [0]) for name in names}
+
+    await app.router.startup()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+            async def send(name: str):
+                method, path, body = scenario_request(name, rng)
+                started = time.perf_counter()
+                response = await client.request(method, path, json=body)
+                return time.perf_counter() - started, response.status_code < 400
+
+            # 워밍업 - 인덱스 생성과 첫 요청 비용은 측정에서 뺀다
+            for name in plan[:warmup]:
+                await send(name)
+
+            queue = iter(plan[warmup:])
+
+            async def worker():
+                for name in queue:
+                    latency, ok = await send(name)
+                    latencies, errors = results[name]
+                    latencies.append(latency)
+                    if not ok:
+                        errors[0] += 1
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            elapsed = time.perf_counter() - started
+    finally:
+        await app.router.shutdown()
+
+    all_latencies = [latency for latencies, _ in results.values() for latency in latencies]
+    return {
+        'elapsed_s': round(elapsed, 3),
+        **summarize(all_latencies, sum(errors[0] for _, errors in results.values()), elapsed),
+        'scenarios': {name: summarize(latencies, errors[0], elapsed) for name, (latencies, errors) in results.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scores', type=int, default=100000, help='미리 넣어 둘 합성 점수 수')
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--warmup', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--backend', default='json', choices=sorted(FILENAMES))
+    parser.add_argument('--fsync', default='interval')
+    parser.add_argument('--mix', default='leaderboard=5,page=1,week=1,stats=2,score=1')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='결과 JSON 을 이 파일에도 저장')
+    args = parser.parse_args()
+    weights = parse_mix(args.mix)
+
+    workdir = tempfile.mkdtemp(prefix='bench-api-')
+    try:
+        manager = ScoreManager(filename=os.path.join(workdir, FILENAMES[args.backend]),
+                               backend=args.backend, fsync=args.fsync)
+        seed_scores(manager, args.scores, args.seed)
+        app = create_app(manager)
+        result = asyncio.run(run(app, weights, args.requests, args.warmup, args.concurrency, args.seed))
+        report = {
+            'commit': git_commit(),
+            'python': sys.version.split()[0],
+            'backend': args.backend,
+            'fsync': args.fsync,
+            'scores': args.scores,
+            'concurrency': args.concurrency,
+            'mix': weights,
+            **result,
+            'operations': manager.metrics.operation_summary(),
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    line = json.dumps(report, ensure_ascii=False)
+    print(line, flush=True)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(line + '\n')
+
+
+if __name__ == '__main__':
+    main()
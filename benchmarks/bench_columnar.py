@@ -0,0 +1,124 @@
+"""점수 메모리 표현 벤치마크 - List[GameScore] vs 열 배열 vs mmap 바이너리
+
+    python -m benchmarks.bench_columnar              # 1M 건
+    python -m benchmarks.bench_columnar --rows 100000
+
+- list: 기존 방식. 행마다 GameScore 객체 + ISO 문자열, 조회마다 전체 정렬/리스트 생성
+- columns: ScoreColumns (array('i') x2 + array('q')), LeaderboardIndex + StatsAccumulator.add_many
+- binary: BinaryScoreStore 파일을 mmap 으로 열어 같은 인덱스를 만든다
+
+메모리는 tracemalloc 으로 잰 파이썬 힙 증가분이다 (mmap 페이지는 포함되지 않으므로 파일 크기를 함께 출력).
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from backend.columns import ScoreColumns
+from backend.leaderboard import LeaderboardIndex
+from backend.models import GameScore
+from backend.stats import StatsAccumulator
+from backend.storage import BinaryScoreStore
+
+
+def synthetic_records(count: int):
+    rnd = random.Random(42)
+    start = datetime(2024, 1, 1)
+    return [
+        {
+            'time': int(rnd.expovariate(1 / 60)) % 86400,
+            'clicks': rnd.randint(1, 5),
+            'timestamp': (start + timedelta(microseconds=i * 1000003)).isoformat()
+        }
+        for i in range(count)
+    ]
+
+
+def measure(fn):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed * 1000, current
+
+
+def report(mode: str, rows: int, build_ms: float, memory: int, leaderboard_ms: float, stats_ms: float, **extra):
+    print(json.dumps({
+        'mode': mode,
+        'rows': rows,
+        'build_ms': round(build_ms, 1),
+        'memory_mb': round(memory / 2 ** 20, 1),
+        'bytes_per_row': round(memory / rows, 1),
+        'leaderboard_ms': round(leaderboard_ms, 1),
+        'stats_ms': round(stats_ms, 1),
+        **extra
+    }), flush=True)
+
+
+def bench_list(records):
+    scores, build_ms, memory = measure(lambda: [GameScore.from_dict(r) for r in records])
+
+    started = time.perf_counter()
+    sorted(scores, key=lambda x: x.time, reverse=True)[:10]
+    leaderboard_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    times = [score.time for score in scores]
+    clicks = [score.clicks for score in scores]
+    len(scores), max(times), sum(times), sum(clicks)
+    stats_ms = (time.perf_counter() - started) * 1000
+    report('list', len(records), build_ms, memory, leaderboard_ms, stats_ms)
+
+
+def bench_columns(columns: ScoreColumns, mode: str, build_ms: float, memory: int, **extra):
+    started = time.perf_counter()
+    leaderboard = LeaderboardIndex(1000)
+    leaderboard.extend(columns.times, 0)
+    [columns.row(i) for i in leaderboard.top(10)]
+    leaderboard_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    StatsAccumulator().add_many(columns.times, columns.clicks)
+    stats_ms = (time.perf_counter() - started) * 1000
+    report(mode, len(columns), build_ms, memory, leaderboard_ms, stats_ms, **extra)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000000)
+    args = parser.parse_args()
+
+    records = synthetic_records(args.rows)
+    bench_list(records)
+
+    columns, build_ms, memory = measure(lambda: ScoreColumns.from_records(records))
+    bench_columns(columns, 'columns', build_ms, memory)
+
+    workdir = tempfile.mkdtemp(prefix='bench-columnar-')
+    try:
+        filename = os.path.join(workdir, 'scores.bin')
+        store = BinaryScoreStore(filename)
+        store.replace(records)
+        store.close()
+        del records
+
+        def open_store():
+            store = BinaryScoreStore(filename)
+            store.refresh()
+            return store
+        store, build_ms, memory = measure(open_store)
+        bench_columns(store.columns(), 'binary', build_ms, memory, file_mb=round(os.path.getsize(filename) / 2 ** 20, 1))
+        store.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
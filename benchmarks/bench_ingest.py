@@ -0,0 +1,101 @@
+"""점수 저장 경로 벤치마크 - 요청마다 쓰기 vs 그룹 커밋(ScoreBatcher)
+
+    python -m benchmarks.bench_ingest
+    python -m benchmarks.bench_ingest --requests 20000 --concurrency 128 --backend sqlite
+
+- sync: 기존 방식. 스레드 풀(FastAPI 기본 40개)에서 요청마다 add_score 로 쓴다
+- batched: 동시 요청들이 ScoreBatcher 에 넣고 배치가 디스크에 반영될 때까지 기다린다
+
+두 경로 모두 같은 fsync 정책(기본 always = 요청/배치마다 fsync)으로 비교하고
+요청 지연 p50/p99(ms)와 초당 처리량을 JSON 한 줄씩 출력한다.
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.ingest import ScoreBatcher
+from backend.models import ScoreManager, GameScore
+
+THREADPOOL_SIZE = 40
+
+
+def percentile(samples, q: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+
+def report(mode: str, latencies, elapsed: float, **extra) -> None:
+    print(json.dumps({
+        'mode': mode,
+        'requests': len(latencies),
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.5) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        **extra
+    }), flush=True)
+
+
+def bench_sync(manager: ScoreManager, requests: int) -> None:
+    def one(i):
+        started = time.perf_counter()
+        manager.add_score(GameScore(time=i % 600, clicks=1))
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(THREADPOOL_SIZE) as executor:
+        latencies = list(executor.map(one, range(requests)))
+    report('sync', latencies, time.perf_counter() - started)
+
+
+async def bench_batched(manager: ScoreManager, requests: int, concurrency: int,
+                        max_batch: int, max_delay_ms: float) -> None:
+    batcher = ScoreBatcher(manager, max_batch=max_batch, max_delay_ms=max_delay_ms)
+    await batcher.start()
+    latencies = []
+    counter = iter(range(requests))
+
+    async def client():
+        for i in counter:
+            started = time.perf_counter()
+            await batcher.submit(GameScore(time=i % 600, clicks=1))
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    await batcher.stop()
+    report('batched', latencies, elapsed, max_batch=max_batch, max_delay_ms=max_delay_ms)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--backend', default='json')
+    parser.add_argument('--fsync', default='always')
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--batch-delay-ms', type=float, default=2.0)
+    args = parser.parse_args()
+
+    for mode in ('sync', 'batched'):
+        workdir = tempfile.mkdtemp(prefix='bench-ingest-')
+        filename = os.path.join(workdir, 'scores.db' if args.backend == 'sqlite' else 'scores.json')
+        manager = ScoreManager(filename=filename, backend=args.backend, fsync=args.fsync)
+        try:
+            if mode == 'sync':
+                bench_sync(manager, args.requests)
+            else:
+                asyncio.run(bench_batched(manager, args.requests, args.concurrency,
+                                          args.batch_size, args.batch_delay_ms))
+        finally:
+            manager.close()
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
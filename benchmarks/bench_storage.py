@@ -0,0 +1,102 @@
+"""점수 저장소 백엔드 벤치마크
+
+    python -m benchmarks.bench_storage                       # 10k, 1M, 10M
+    python -m benchmarks.bench_storage --sizes 10000,100000 --backends sqlite
+
+각 크기마다 임시 디렉터리에 점수를 채운 뒤 다음을 측정한다
+- open: 저장소를 새로 열고 첫 통계를 얻기까지 걸린 시간
+- insert / leaderboard / leaderboard_deep / stats: 호출당 평균, p99 (밀리초)
+"""
+import argparse
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from backend.models import ScoreManager, GameScore
+from backend.storage import BACKENDS
+
+SEED_CHUNK = 100000
+
+
+def synthetic_records(count: int, seed: int = 42):
+    rnd = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    for i in range(count):
+        yield {
+            'time': int(rnd.expovariate(1 / 60)) % 86400,
+            'clicks': rnd.randint(1, 5),
+            'timestamp': (start + timedelta(seconds=i)).isoformat()
+        }
+
+
+def seed(manager: ScoreManager, count: int) -> None:
+    if manager.store.indexed:
+        chunk = []
+        for record in synthetic_records(count):
+            chunk.append(record)
+            if len(chunk) >= SEED_CHUNK:
+                manager.store.append_many(chunk)
+                chunk = []
+        manager.store.append_many(chunk)
+    else:
+        # JSON 로그는 어차피 전체를 메모리에 두므로 스냅샷 한 번으로 채운다
+        manager.store.replace(synthetic_records(count))
+
+
+def measure(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return statistics.mean(samples), samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+
+
+def run(backend: str, size: int, repeat: int) -> dict:
+    workdir = tempfile.mkdtemp(prefix='bench-storage-')
+    filename = os.path.join(workdir, 'scores.db' if backend == 'sqlite' else 'scores.json')
+    try:
+        manager = ScoreManager(filename=filename, backend=backend)
+        seed(manager, size)
+        manager.close()
+
+        manager = ScoreManager(filename=filename, backend=backend)
+        started = time.perf_counter()
+        manager.get_stats()
+        result = {'backend': backend, 'size': size, 'open': (time.perf_counter() - started) * 1000}
+
+        rnd = random.Random(7)
+        result['insert'] = measure(
+            lambda: manager.add_score(GameScore(time=rnd.randint(0, 600), clicks=1)), repeat)
+        result['leaderboard'] = measure(lambda: manager.get_leaderboard(10), repeat)
+        result['leaderboard_deep'] = measure(lambda: manager.get_leaderboard(10, 5000), max(1, repeat // 100))
+        result['stats'] = measure(manager.get_stats, repeat)
+        manager.close()
+        return result
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='10000,1000000,10000000')
+    parser.add_argument('--backends', default=','.join(BACKENDS))
+    parser.add_argument('--repeat', type=int, default=1000)
+    args = parser.parse_args()
+
+    ops = ('insert', 'leaderboard', 'leaderboard_deep', 'stats')
+    print(f"{'backend':<8} {'size':>10} {'open(ms)':>10} " + ' '.join(f'{op + " avg/p99":>26}' for op in ops))
+    for size in (int(s) for s in args.sizes.split(',')):
+        for backend in args.backends.split(','):
+            result = run(backend, size, args.repeat)
+            cells = ' '.join(f'{result[op][0]:>12.3f} / {result[op][1]:>11.3f}' for op in ops)
+            print(f"{backend:<8} {size:>10} {result['open']:>10.1f} {cells}", flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""여러 uvicorn 워커에 POST /score 를 동시에 보내서 점수가 유실되지 않는지 확인하는 부하 테스트
+
+    python -m benchmarks.load_test_scores --workers 4 --requests 5000 --concurrency 64
+    python -m benchmarks.load_test_scores --backend sqlite
+
+임시 디렉터리의 저장소로 서버를 띄우고, 모든 요청을 보낸 뒤
+- 어느 워커에 물어봐도 /stats 의 total_games 가 성공한 요청 수와 같은지
+- 서버를 내린 뒤 저장소를 다시 열었을 때 점수 수가 같은지
+를 확인한다. 하나라도 어긋나면 종료 코드 1.
+"""
+import argparse
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.models import ScoreManager
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def request(url: str, payload: dict = None) -> dict:
+    data = json.dumps(payload).encode() if payload is not None else None
+    req = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(req, timeout=30) as response:
+        return json.loads(response.read())
+
+
+def wait_until_ready(base_url: str, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            request(f'{base_url}/health')
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError('서버가 시작되지 않았습니다')
+
+
+def post_score(base_url: str, i: int) -> bool:
+    try:
+        request(f'{base_url}/score', {'time': i % 600, 'clicks': 1 + i % 5})
+        return True
+    except OSError:
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--backend', default='json')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--compact-threshold', type=int, default=500)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='load-test-')
+    filename = os.path.join(workdir, 'scores.db' if args.backend == 'sqlite' else 'scores.json')
+    env = dict(os.environ, SCORES_BACKEND=args.backend, SCORES_FILE=filename,
+               SCORES_COMPACT_THRESHOLD=str(args.compact_threshold))
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'server:app', '--port', str(args.port),
+         '--workers', str(args.workers), '--log-level', 'warning'],
+        cwd=ROOT, env=env,
+    )
+    base_url = f'http://127.0.0.1:{args.port}'
+    try:
+        wait_until_ready(base_url)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(args.concurrency) as executor:
+            results = list(executor.map(lambda i: post_score(base_url, i), range(args.requests)))
+        elapsed = time.perf_counter() - started
+        saved = sum(results)
+        print(f'POST {args.requests}건 중 {saved}건 성공, {elapsed:.2f}초 ({args.requests / elapsed:.0f} req/s)')
+
+        # 요청마다 다른 워커가 받을 수 있으므로 여러 번 확인한다
+        seen = {request(f'{base_url}/stats')['total_games'] for _ in range(args.workers * 4)}
+        print(f'/stats total_games: {sorted(seen)}')
+    finally:
+        server.send_signal(signal.SIGINT)
+        server.wait(timeout=30)
+
+    manager = ScoreManager(filename=filename, backend=args.backend)
+    stored = manager.get_stats()['total_games']
+    manager.close()
+    shutil.rmtree(workdir, ignore_errors=True)
+    print(f'재시작 후 저장된 점수: {stored}건')
+
+    ok = saved == args.requests and seen == {saved} and stored == saved
+    print('OK' if ok else 'FAIL - 점수가 유실되었습니다')
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
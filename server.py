@@ -1,9 +1,47 @@
+import os
+from typing import Optional
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from backend.models import ScoreManager
+from backend.ingest import ScoreBatcher
+from backend.cache import ResponseCache
+from backend.metrics import Metrics, MetricsMiddleware
 from backend.routes import api
 
-def create_app():
-    """FastAPI 애플리케이션 팩토리"""
+def create_app(score_manager: Optional[ScoreManager] = None):
+    """FastAPI 애플리케이션 팩토리
+
+    score_manager 를 넘기지 않으면 환경 변수로 저장소를 고른다
+    - SCORES_BACKEND: json (기본), sqlite, binary
+    - SCORES_FILE: 저장 파일 경로 (기본 scores.json / scores.db / scores.bin)
+    - SCORES_FSYNC: always, interval (기본), never
+    - SCORES_COMPACT_THRESHOLD: JSON 로그 압축 기준 건수 (기본 10000)
+    - SCORES_BATCH_SIZE: POST /score 를 한 번에 묶어 쓰는 최대 건수 (기본 256)
+    - SCORES_BATCH_DELAY_MS: 배치를 모으는 최대 대기 시간 (기본 2ms)
+    - CACHE_MAX_AGE: /leaderboard, /stats 의 Cache-Control max-age 초 (기본 0 = 매번 ETag 재검증)
+    - CACHE_MAX_ENTRIES: 응답 캐시 최대 항목 수 (기본 256)
+    - WINDOW_RETENTION_DAYS: 기간별 집계를 일 단위로 유지하는 일수 (기본 35, 이후 월 단위로 합침)
+    - WINDOW_RETENTION_MONTHS: 월 단위 기간별 집계를 유지하는 개월 수 (기본 24)
+    """
+    if score_manager is None:
+        score_manager = ScoreManager(
+            filename=os.environ.get('SCORES_FILE') or None,
+            backend=os.environ.get('SCORES_BACKEND', 'json'),
+            fsync=os.environ.get('SCORES_FSYNC', 'interval'),
+            compact_threshold=int(os.environ.get('SCORES_COMPACT_THRESHOLD', 10000)),
+            window_retention_days=int(os.environ.get('WINDOW_RETENTION_DAYS', 35)),
+            window_retention_months=int(os.environ.get('WINDOW_RETENTION_MONTHS', 24)),
+        )
+    # 저장소 작업 시간과 요청 지표를 같은 레지스트리에 모은다
+    if score_manager.metrics is None:
+        score_manager.metrics = Metrics()
+    metrics = score_manager.metrics
+    score_batcher = ScoreBatcher(
+        score_manager,
+        max_batch=int(os.environ.get('SCORES_BATCH_SIZE', 256)),
+        max_delay_ms=float(os.environ.get('SCORES_BATCH_DELAY_MS', 2)),
+    )
+
     app = FastAPI(
         title="절대 누르면 안 되는 버튼 게임",
         description="Don't Push The Button Game API",
@@ -18,9 +56,23 @@ def create_app():
         allow_methods=["GET", "POST"],
         allow_headers=["*"],
     )
+    # 라우트별 요청 수/응답 시간 (GET /metrics)
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
     
     # 라우터 등록
+    app.state.score_manager = score_manager
+    app.state.score_batcher = score_batcher
+    app.state.metrics = metrics
+    app.state.response_cache = ResponseCache(
+        max_entries=int(os.environ.get('CACHE_MAX_ENTRIES', 256)),
+        max_age=int(os.environ.get('CACHE_MAX_AGE', 0)),
+    )
     app.include_router(api)
+
+    # 시작 시 저장 큐를 띄우고, 종료 시 남은 점수를 모두 쓴 뒤 저장소를 닫기
+    app.add_event_handler('startup', score_batcher.start)
+    app.add_event_handler('shutdown', score_batcher.stop)
+    app.add_event_handler('shutdown', score_manager.close)
     
     return app
 
@@ -0,0 +1,25 @@
+import json
+import os
+
+from backend.models import ScoreManager, GameScore
+
+
+def test_stats_follow_restored_snapshot(tmp_path):
+    """백업한 scores.json 으로 되돌리면 통계도 그 파일 기준으로 다시 계산된다"""
+    filename = str(tmp_path / 'scores.json')
+    manager = ScoreManager(filename)
+    manager.add_scores([GameScore(time=t, clicks=1) for t in (100, 200, 300)])
+    assert manager.get_stats()['best_time'] == 300
+    manager.close()
+
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump([GameScore(time=1, clicks=1).to_dict() for _ in range(4)], f)
+    os.remove(filename + '.log')
+
+    manager = ScoreManager(filename)
+    stats = manager.get_stats()
+    assert stats['total_games'] == 4
+    assert stats['best_time'] == 1
+    assert stats['average_time'] == 1
+    assert manager.get_leaderboard(limit=1)[0].time == 1
+    manager.close()
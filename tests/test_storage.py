@@ -0,0 +1,35 @@
+import pytest
+
+from backend.storage import ScoreLog
+
+
+def record(time: int) -> dict:
+    return {'time': time, 'clicks': 0, 'timestamp': '2024-01-01T00:00:00'}
+
+
+def append(store: ScoreLog, time: int) -> None:
+    store.append(record(time))
+    store._wait_compaction()
+
+
+@pytest.mark.parametrize('writes', [10, 13])
+def test_lagging_reader_catches_up_after_two_compactions(tmp_path, writes):
+    """다른 워커가 압축을 두 번 하는 동안 쉬던 워커도 점수를 잃지 않는다
+
+    writes=10 이면 마지막 압축 직후라 현재 로그가 비어 있는 경우다.
+    """
+    filename = str(tmp_path / 'scores.json')
+    writer = ScoreLog(filename, compact_threshold=5)
+    lagging = ScoreLog(filename, compact_threshold=5)
+    lagging.refresh()
+
+    for time in range(writes):
+        append(writer, time)
+
+    assert [r['time'] for r in lagging.records()] == list(range(writes))
+
+    append(lagging, 99)
+    fresh = ScoreLog(filename)
+    assert [r['time'] for r in fresh.records()] == list(range(writes)) + [99]
+    for store in (writer, lagging, fresh):
+        store.close()
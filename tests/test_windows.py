@@ -0,0 +1,29 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from backend.models import ScoreManager, GameScore
+from backend.windows import resolve_window, MAX_MICROS
+
+
+def test_mixed_timezone_bounds_are_compared_as_local_time():
+    start = datetime(2026, 10, 18, tzinfo=timezone.utc)
+    start_micros, end_micros = resolve_window(start=start, end=datetime(2026, 10, 20))
+    assert start_micros < end_micros
+
+    with pytest.raises(ValueError):
+        resolve_window(start=datetime(2026, 10, 20), end=datetime(2026, 10, 18, tzinfo=timezone.utc))
+
+
+def test_end_is_capped_at_max_datetime():
+    assert resolve_window(end=datetime(9999, 12, 31, 12))[1] == MAX_MICROS
+
+
+@pytest.mark.parametrize('backend', ['json', 'sqlite', 'binary'])
+def test_window_up_to_last_day(tmp_path, backend):
+    manager = ScoreManager(str(tmp_path / 'scores'), backend=backend)
+    manager.add_scores([GameScore(time=5, clicks=1, timestamp='2026-10-18T09:00:00')])
+    window = resolve_window(start=datetime(2026, 10, 1), end=datetime(9999, 12, 31, 12))
+    assert [score.time for score in manager.get_leaderboard(window=window)] == [5]
+    assert manager.get_stats(window=window)['total_games'] == 1
+    manager.close()